@@ -0,0 +1,123 @@
+import random
+import subprocess
+import sys
+import time
+
+# Chhote micro-benchmarks: `python benchmarks.py [tokenizer] [imports]`
+
+
+def _synthetic_lines(count, seed=7):
+    rng = random.Random(seed)
+    words = ["UPI", "NEFT", "IMPS", "transfer", "to", "from", "Ramesh", "Traders", "Rent",
+             "electricity", "salary", "refund", "petrol", "swiggy", "payment", "received",
+             "paid", "bill", "gst", "shop", "ref", "cash", "deposit", "withdrawal"]
+    lines = []
+    for _ in range(count):
+        day, month = rng.randint(1, 28), rng.randint(1, 12)
+        desc = " ".join(rng.choice(words) for _ in range(rng.randint(3, 8)))
+        amount = f"{rng.randint(1, 250000):,}.{rng.randint(0, 99):02d}"
+        prefix = rng.choice(["Rs. ", "INR ", "₹", ""])
+        lines.append(f"{day:02d}/{month:02d}/2024 {desc} {prefix}{amount} Dr")
+    return lines
+
+
+def _legacy_parse_line(line, core):
+    # Purana tareeka: findall + do keyword any() scans + alag date regex + categorize
+    amounts = core.AMOUNT_REGEX.findall(line)
+    if not amounts:
+        return None
+    amt = core.clean_amount(amounts[-1])
+    if amt <= 0:
+        return None
+    lower = line.lower()
+    is_debit = any(k in lower for k in core.DEBIT_KEYWORDS)
+    is_credit = any(k in lower for k in core.CREDIT_KEYWORDS)
+    if is_debit == is_credit:
+        return None
+    m = core.DATE_TOKEN_REGEX.search(line)
+    return amt, m.group(0) if m else None, _legacy_categorize(lower, core), is_debit
+
+
+def _legacy_categorize(low, core):
+    # Purana categorize_transaction: har category ke terms par alag any() scan
+    for category, terms in core.CATEGORY_RULES.items():
+        if any(t in low for t in terms):
+            return category
+    return "Other"
+
+
+def _tokenized_parse_line(line, core):
+    amount, date_token, category, is_debit, is_credit = core.tokenize_statement_line(line)
+    if amount is None or is_debit == is_credit:
+        return None
+    amt = core.clean_amount(amount)
+    if amt <= 0:
+        return None
+    return amt, date_token, category, is_debit
+
+
+def _time(fn, lines, core, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            fn(line, core)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_tokenizer(count=20000):
+    import dukandar_core as core
+    lines = _synthetic_lines(count)
+    legacy = _time(_legacy_parse_line, lines, core)
+    tokenized = _time(_tokenized_parse_line, lines, core)
+    print(f"PDF line tokenizer ({count} lines, best of 5)")
+    print(f"  legacy regex + keyword scans : {legacy * 1000:8.1f} ms")
+    print(f"  single-pass tokenizer        : {tokenized * 1000:8.1f} ms")
+    print(f"  speedup                      : {legacy / tokenized:8.2f}x")
+
+
+def _cold_import_seconds(statement, repeat=5):
+    # Har baar naya interpreter, taaki module cache ka fayda na mile
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_imports():
+    baseline = _cold_import_seconds("pass")
+    cases = [
+        ("dukandar_core (Kivy/CLI)", "import dukandar_core"),
+        ("myfile (entry point)", "import myfile"),
+        ("dukandar_gui (Tkinter)", "import dukandar_gui"),
+        ("old eager pdfplumber+pytesseract",
+         "import dukandar_core; dukandar_core.load_pdfplumber(); dukandar_core.load_pytesseract()"),
+    ]
+    print(f"Cold import time (best of 5, interpreter startup {baseline * 1000:.1f} ms subtracted)")
+    for label, statement in cases:
+        try:
+            elapsed = _cold_import_seconds(statement)
+        except subprocess.CalledProcessError:
+            print(f"  {label:34}: import failed")
+            continue
+        print(f"  {label:34}: {(elapsed - baseline) * 1000:8.1f} ms")
+
+
+BENCHMARKS = {
+    "tokenizer": bench_tokenizer,
+    "imports": bench_imports,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choices: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        BENCHMARKS[name]()
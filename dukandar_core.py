@@ -0,0 +1,2687 @@
+import codecs
+import csv
+import hashlib
+import heapq
+import html
+import json
+import os
+import queue
+import re
+import shutil
+import struct
+import sys
+import time
+import traceback
+import zlib
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+
+from collections import defaultdict
+
+from money_utils import Money, money, parse_paise, to_paise
+
+# pdfplumber/pytesseract bhaari hain: import tabhi jab pehli PDF/OCR zaroorat ho (fast startup)
+_pdfplumber = None
+_pytesseract = None
+
+
+def load_pdfplumber():
+    global _pdfplumber
+    if _pdfplumber is None:
+        try:
+            import pdfplumber
+        except Exception:
+            pdfplumber = False
+        _pdfplumber = pdfplumber
+    return _pdfplumber or None
+
+
+def load_pytesseract():
+    global _pytesseract
+    if _pytesseract is None:
+        try:
+            import pytesseract
+        except Exception:
+            _pytesseract = False
+        else:
+            tess_cmd = os.environ.get("TESSERACT_CMD", "").strip()
+            if tess_cmd and Path(tess_cmd).exists():
+                pytesseract.pytesseract.tesseract_cmd = tess_cmd
+            else:
+                auto_tess = shutil.which("tesseract")
+                default_win_tess = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+                if auto_tess:
+                    pytesseract.pytesseract.tesseract_cmd = auto_tess
+                elif Path(default_win_tess).exists():
+                    pytesseract.pytesseract.tesseract_cmd = default_win_tess
+            _pytesseract = pytesseract
+    return _pytesseract or None
+
+APP_TITLE = "Dukandar GST Statement Tool"
+PAYMENT_LINK = "https://razorpay.me/@vikrambhaiparabatabhaisengal"   # <- apna Razorpay/Paytm payment link
+DOWNLOAD_LINK = "https://github.com/vikramsengal/dukandar-shop-tool/raw/main/dist/myfile.exe"  # <- direct GitHub download link
+UPI_ID = "sengalvikram004-2@oksbi"  # <- apni UPI ID
+PAYEE_NAME = "apna Tool"
+PAY_AMOUNT = 10
+UPI_NOTE = "Dukandar Tool 1 month unlock"
+FREE_TRIES = 10  
+QR_IMAGE_PATH = "QR_code.png"  # <- app ke same folder me QR image rakho (png/jpg supported via fallback)
+ADMIN_UNLOCK_CODE = "CHANGE_ME_UNLOCK_2026"  # <- payment receive verify karne ke baad user ko yahi code do
+STATE_FILE = Path.home() / ".dukandar_tool_state.json"
+LOG_FILE = Path.home() / ".dukandar_tool_error.log"
+AUDIT_FILE = Path.home() / ".dukandar_tool_audit.log"
+BACKUP_DIR = Path.home() / ".dukandar_tool_backups"
+PARSE_CACHE_DIR = Path.home() / ".dukandar_tool_cache" / "parsed"
+PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+PARSE_CACHE_MAX_AGE_DAYS = 45
+PDF_WORKERS_ENV = "DUKANDAR_PDF_WORKERS"
+PDF_PARALLEL_MIN_PAGES = 8
+OCR_CACHE_DIR = Path.home() / ".dukandar_tool_cache" / "ocr"
+OCR_CACHE_MAX_BYTES = 64 * 1024 * 1024
+OCR_CACHE_MAX_AGE_DAYS = 120
+OCR_WORKERS_ENV = "DUKANDAR_OCR_WORKERS"
+OCR_BATCH_PAGES = 4
+OCR_DPI = 220
+OCR_TESSERACT_CONFIG = ""
+DUPLICATE_DAY_WINDOW = 2
+DUPLICATE_MIN_SIMILARITY = 0.6
+DUPLICATE_MAX_CANDIDATES = 32
+ROUND_TRIP_DAY_WINDOW = 3
+ROUND_TRIP_TOLERANCE_PCT = 1.0
+INVOICE_AMOUNT_TOLERANCE_PCT = 0.5
+INVOICE_DATE_WINDOW_DAYS = 45
+INVOICE_MIN_CONFIDENCE = 35
+INVOICE_MAX_CANDIDATES = 16
+PROGRESS_EVERY_ROWS = 2000
+REPORT_PAGE_ROWS = 500  # HTML report ki transaction/party tables me ek page
+REPORT_MAX_BYTES = 25 * 1024 * 1024  # Isse badi report par baaki rows chhod do
+REPORT_FLUSH_BYTES = 64 * 1024
+APP_VERSION = "1.2.0"
+VERSION_URL = "https://raw.githubusercontent.com/vikramsengal/dukandar-shop-tool/main/VERSION.txt"
+
+
+CATEGORY_RULES = {
+    "Rent": ["rent", "landlord", "lease"],
+    "Salary": ["salary", "payroll", "wage"],
+    "Utilities": ["electricity", "water", "gas", "bill", "recharge", "broadband"],
+    "Food": ["swiggy", "zomato", "restaurant", "food"],
+    "Transfer": ["upi", "imps", "neft", "rtgs", "transfer"],
+    "Shopping": ["amazon", "flipkart", "store", "mart"],
+    "Refund": ["refund", "reversal", "chargeback"],
+    "Tax": ["gst", "tax", "tds", "income tax"],
+}
+CATEGORY_GST_SUGGEST = {
+    "Rent": 18.0,
+    "Salary": 0.0,
+    "Utilities": 18.0,
+    "Food": 5.0,
+    "Transfer": 0.0,
+    "Shopping": 18.0,
+    "Refund": 0.0,
+    "Tax": 0.0,
+    "Other": 18.0,
+}
+# Suspicious alerts + anomaly score dono isi config se; naya rule = nayi entry, naya pass nahi.
+# Conditions (sab AND): min_amount, terms, unknown_date, max_description_length, round_trip
+RISK_RULES = [
+    {"name": "high_value", "min_amount": 100000, "score": 40, "reason": "High amount",
+     "alert": "High-value txn: {date} {amount} ({type})"},
+    {"name": "cash_keyword", "terms": ["cash"], "score": 20, "reason": "Cash keyword"},
+    {"name": "large_cash", "terms": ["cash"], "min_amount": 20000,
+     "alert": "Large cash-related txn: {date} {amount}"},
+    {"name": "unknown_date", "unknown_date": True, "score": 15, "reason": "Unknown date"},
+    {"name": "weak_narration", "max_description_length": 3, "score": 10, "reason": "Weak narration"},
+    # Debit aur lagbhag barabar credit N din ke andar (round_trip: True ya {"day_window", "tolerance_pct"})
+    {"name": "round_trip", "round_trip": True,
+     "alert": "{kind} pattern on {date} for {amount} ({days_apart}d apart)"},
+]
+
+
+DEBIT_KEYWORDS = [
+    "debit", "debited", "paid", "payment", "sent", "transfer to", "withdraw", "dr"
+]
+CREDIT_KEYWORDS = [
+    "credit", "credited", "received", "collect", "deposit", "refund", "cr", "added"
+]
+
+AMOUNT_REGEX = re.compile(
+    r"(?:INR|Rs\.?|₹)?\s*([0-9]{1,3}(?:,[0-9]{2,3})*(?:\.\d{1,2})?|[0-9]+(?:\.\d{1,2})?)",
+    re.IGNORECASE
+)
+DATE_TOKEN_REGEX = re.compile(r"\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b")
+
+DATE_FORMATS = [
+    "%d-%m-%Y", "%d/%m/%Y", "%d-%m-%y", "%d/%m/%y",
+    "%Y-%m-%d", "%Y/%m/%d",
+    "%m-%d-%Y", "%m/%d/%Y", "%m-%d-%y", "%m/%d/%y",
+]
+
+
+PDF_COLUMN_KEYWORDS = [
+    ("balance", ["balance", "bal"]),
+    ("debit", ["debit", "withdraw", "dr"]),
+    ("credit", ["credit", "deposit", "cr"]),
+    ("date", ["date", "dt"]),
+    ("narration", ["narration", "description", "particular", "remark", "detail"]),
+    ("amount", ["amount", "amt"]),
+]
+# "Dr/Cr", "Cr/Dr", "Type" wala column: sirf Amount column ka sign batata hai
+PDF_TYPE_COLUMN_TOKENS = ({"dr", "cr"}, {"type"})
+PDF_ROW_TOLERANCE = 3
+
+
+BANK_HINTS = {
+    "SBI": ["state bank", "sbi", "sb account", "txn ref no"],
+    "HDFC": ["hdfc", "chq./ref.no.", "narration", "value dt"],
+    "ICICI": ["icici", "transaction remarks", "withdrawal amt", "deposit amt"],
+    "AXIS": ["axis", "tran date", "particulars", "chq no"],
+}
+
+
+def clean_amount(value: str) -> float:
+    return parse_paise(value) / 100.0
+
+
+def guess_column(columns, candidates):
+    low = [c.strip().lower() for c in columns]
+    for i, c in enumerate(low):
+        for k in candidates:
+            if k in c:
+                return columns[i]
+    return None
+
+
+DATE_LOCK_SAMPLES = 20
+DATE_LEARN_PAGES = 3  # PDF ka date format pehle itne pages se seekh ke poori file par lock
+
+
+def _date_token(value):
+    if value is None:
+        return ""
+    return str(value).strip().split(" ")[0].strip()
+
+
+@lru_cache(maxsize=8192)
+def _parse_date_token(txt, fmt):
+    try:
+        return datetime.strptime(txt, fmt).date()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=8192)
+def _scan_date_token(txt):
+    for fmt in DATE_FORMATS:
+        d = _parse_date_token(txt, fmt)
+        if d is not None:
+            return d
+    return None
+
+
+class DateParser:
+    # Ek statement me date format same rehta hai: pehli rows se format pakad ke lock kar do
+    def __init__(self, lock_after=DATE_LOCK_SAMPLES, locked=None):
+        self.lock_after = lock_after
+        self.candidates = list(DATE_FORMATS)
+        self.samples = 0
+        self.locked = locked
+
+    def parse(self, value):
+        txt = _date_token(value)
+        if not txt:
+            return None
+        if self.locked:
+            d = _parse_date_token(txt, self.locked)
+            return d if d is not None else _scan_date_token(txt)
+        matching = [fmt for fmt in self.candidates if _parse_date_token(txt, fmt) is not None]
+        if not matching:
+            return _scan_date_token(txt)
+        self.candidates = matching
+        self.samples += 1
+        if len(matching) == 1 or self.samples >= self.lock_after:
+            self.locked = matching[0]
+        return _parse_date_token(txt, matching[0])
+
+    def normalize(self, value):
+        d = self.parse(value)
+        return d.isoformat() if d else None
+
+
+def learn_date_format(texts):
+    # Poori file ke liye ek hi format (worker kitne bhi hon): pehle pages ke date tokens se
+    dates = DateParser()
+    for text in texts:
+        for m in DATE_TOKEN_REGEX.finditer(text):
+            dates.parse(m.group(1))
+            if dates.locked:
+                return dates.locked
+    return dates.candidates[0] if dates.samples else None
+
+
+def normalize_date(value):
+    txt = _date_token(value)
+    if not txt:
+        return None
+    d = _scan_date_token(txt)
+    return d.isoformat() if d else None
+
+
+def extract_date_from_line(line, dates=None):
+    m = DATE_TOKEN_REGEX.search(line or "")
+    if not m:
+        return None
+    if dates is not None:
+        return dates.normalize(m.group(1))
+    return normalize_date(m.group(1))
+
+
+@lru_cache(maxsize=8192)
+def to_date_obj(date_str):
+    if not date_str or date_str == "Unknown Date":
+        return None
+    try:
+        return date.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return None
+
+
+def month_key(date_str):
+    d = to_date_obj(date_str)
+    if d is None:
+        return "Unknown Month"
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+class KeywordMatcher:
+    # Saari rule tables ka ek hi regex: har description ek scan me category + debit/credit deta hai
+    def __init__(self, category_rules, debit_keywords=DEBIT_KEYWORDS, credit_keywords=CREDIT_KEYWORDS):
+        self.categories = list(category_rules)
+        info = {}
+        for rank, terms in enumerate(category_rules.values()):
+            for t in terms:
+                t = str(t).strip().lower()
+                if t:
+                    info.setdefault(t, [len(self.categories), False, False])
+                    info[t][0] = min(info[t][0], rank)
+        for flag, terms in ((1, debit_keywords), (2, credit_keywords)):
+            for t in terms:
+                info.setdefault(t, [len(self.categories), False, False])[flag] = True
+
+        # Lookahead har position par sirf sabse lamba term pakadta hai, isliye
+        # "transfer to" match ho to uske andar wale "transfer" ki info bhi saath jod do
+        self.term_info = {}
+        for term in info:
+            rank, is_debit, is_credit = len(self.categories), False, False
+            for other, (o_rank, o_debit, o_credit) in info.items():
+                if other in term:
+                    rank = min(rank, o_rank)
+                    is_debit = is_debit or o_debit
+                    is_credit = is_credit or o_credit
+            self.term_info[term] = (rank, is_debit, is_credit)
+
+        # Parse cache isi signature se pehchanta hai ki rules badle ya nahi
+        self.signature = hashlib.sha1(repr((self.categories, sorted(self.term_info.items()))).encode("utf-8")).hexdigest()
+        alternation = "|".join(re.escape(t) for t in sorted(info, key=len, reverse=True))
+        self.regex = re.compile(f"(?=({alternation}))") if alternation else None
+        # PDF line ke liye: keyword, date token aur amount ek hi left-to-right scan me.
+        # Keyword classify() ki tarah lookahead se (zero-width): overlap wale terms ("martgstdry" me
+        # "gst" aur "dr") bhi pakde jaate hain, isliye category/flags classify_text ke barabar.
+        # Date amount se pehle try hota hai taaki "01/02/2024" ke tukde amount na ban jayein
+        parts = [f"(?=(?P<kw>{alternation}))"] if alternation else []
+        parts.append(r"(?P<date>\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b)")
+        parts.append(r"(?P<amt>[0-9]{1,3}(?:,[0-9]{2,3})*(?:\.\d{1,2})?|[0-9]+(?:\.\d{1,2})?)")
+        self.line_regex = re.compile("|".join(parts))
+
+    def classify(self, text):
+        rank, is_debit, is_credit = len(self.categories), False, False
+        if self.regex is not None and text:
+            term_info = self.term_info
+            for m in self.regex.finditer(text.lower()):
+                r, d, c = term_info[m.group(1)]
+                if r < rank:
+                    rank = r
+                is_debit = is_debit or d
+                is_credit = is_credit or c
+        category = self.categories[rank] if rank < len(self.categories) else "Other"
+        return category, is_debit, is_credit
+
+    def tokenize_line(self, line):
+        rank, is_debit, is_credit = len(self.categories), False, False
+        amount = None
+        date_token = None
+        term_info = self.term_info
+        for m in self.line_regex.finditer(line.lower()):
+            kind = m.lastgroup
+            if kind == "amt":
+                amount = m.group("amt")
+            elif kind == "kw":
+                r, d, c = term_info[m.group("kw")]
+                if r < rank:
+                    rank = r
+                is_debit = is_debit or d
+                is_credit = is_credit or c
+            elif date_token is None:
+                date_token = m.group("date")
+        category = self.categories[rank] if rank < len(self.categories) else "Other"
+        return amount, date_token, category, is_debit, is_credit
+
+
+_keyword_matcher = KeywordMatcher(CATEGORY_RULES)
+_custom_category_rules = {}
+
+
+def set_custom_category_rules(custom_rules):
+    # User ke rules (state file se) built-in rules se pehle check hote hain
+    global _keyword_matcher, _custom_category_rules
+    _custom_category_rules = dict(custom_rules or {})
+    rules = {}
+    for category, terms in (custom_rules or {}).items():
+        if isinstance(terms, str):
+            terms = [terms]
+        if isinstance(terms, (list, tuple)) and str(category).strip():
+            rules[str(category).strip()] = list(terms)
+    for category, terms in CATEGORY_RULES.items():
+        rules[category] = rules.get(category, []) + terms
+    _keyword_matcher = KeywordMatcher(rules)
+
+
+def classify_text(text):
+    return _keyword_matcher.classify(text)
+
+
+def tokenize_statement_line(line):
+    return _keyword_matcher.tokenize_line(line)
+
+
+def categorize_transaction(text):
+    return _keyword_matcher.classify(text)[0]
+
+
+def parse_date_input(txt):
+    txt = (txt or "").strip()
+    if not txt:
+        return None
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(txt, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def log_error(err):
+    try:
+        with open(LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(f"\n[{datetime.now().isoformat(timespec='seconds')}] {err}\n")
+            f.write(traceback.format_exc())
+            f.write("\n")
+    except Exception:
+        pass
+
+
+def detect_bank_format_from_text(sample_text):
+    low = (sample_text or "").lower()
+    best_bank = "Unknown"
+    best_score = 0
+    for bank, hints in BANK_HINTS.items():
+        score = sum(1 for h in hints if h in low)
+        if score > best_score:
+            best_bank = bank
+            best_score = score
+    if best_score == 0:
+        return "Unknown", "Generic", "low"
+    confidence = "high" if best_score >= 2 else "medium"
+    return best_bank, f"{best_bank}-like", confidence
+
+
+_ocr_stats_lock = threading.Lock()
+_ocr_stats = {"pages": 0, "hits": 0, "misses": 0, "errors": 0, "seconds": 0.0}
+
+
+def _bump_ocr_stats(**delta):
+    with _ocr_stats_lock:
+        for k, v in delta.items():
+            _ocr_stats[k] += v
+
+
+def ocr_cache_stats():
+    with _ocr_stats_lock:
+        return dict(_ocr_stats)
+
+
+def reset_ocr_stats():
+    with _ocr_stats_lock:
+        for k in _ocr_stats:
+            _ocr_stats[k] = 0.0 if k == "seconds" else 0
+
+
+def resolve_ocr_workers(workers=None):
+    if workers is None:
+        workers = os.environ.get(OCR_WORKERS_ENV, "").strip()
+    try:
+        n = int(workers)
+    except (TypeError, ValueError):
+        n = 0
+    # tesseract alag process me chalta hai, isliye threads kaafi hain
+    return n if n > 0 else min(4, os.cpu_count() or 1)
+
+
+_tesseract_version = None
+
+
+def tesseract_version():
+    global _tesseract_version
+    if _tesseract_version is None:
+        pytesseract = load_pytesseract()
+        try:
+            _tesseract_version = str(pytesseract.get_tesseract_version()) if pytesseract else ""
+        except Exception:
+            _tesseract_version = ""
+    return _tesseract_version
+
+
+def _image_digest(img):
+    # tesseract version/config badle to purana OCR text cache se na mile
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{tesseract_version()}|{OCR_TESSERACT_CONFIG}|".encode("utf-8"))
+    h.update(f"{img.mode}|{img.size}|".encode("ascii"))
+    h.update(img.tobytes())
+    return h.hexdigest()
+
+
+def ocr_image(img):
+    pytesseract = load_pytesseract()
+    if img is None or pytesseract is None:
+        return ""
+    try:
+        cache_path = OCR_CACHE_DIR / f"{_image_digest(img)}.txt"
+    except Exception:
+        cache_path = None
+    if cache_path is not None and cache_path.exists():
+        try:
+            text = cache_path.read_text(encoding="utf-8")
+            os.utime(cache_path)
+            _bump_ocr_stats(pages=1, hits=1)
+            return text
+        except OSError:
+            pass
+
+    started = time.perf_counter()
+    try:
+        text = pytesseract.image_to_string(img, config=OCR_TESSERACT_CONFIG) or ""
+    except Exception:
+        _bump_ocr_stats(pages=1, errors=1)
+        return ""
+    _bump_ocr_stats(pages=1, misses=1, seconds=time.perf_counter() - started)
+    if cache_path is not None:
+        try:
+            OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return text
+
+
+def ocr_pages(pages, workers=None):
+    if load_pytesseract() is None or not pages:
+        return [""] * len(pages)
+    # Render isi thread me (pdfminer thread-safe nahi), tesseract calls pool me
+    images = []
+    for page in pages:
+        try:
+            images.append(page.to_image(resolution=OCR_DPI).original)
+        except Exception:
+            _bump_ocr_stats(pages=1, errors=1)
+            images.append(None)
+    workers = min(resolve_ocr_workers(workers), len(images))
+    if workers <= 1:
+        return [ocr_image(img) for img in images]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(ocr_image, images))
+
+
+def extract_text_with_ocr(page):
+    return ocr_pages([page], workers=1)[0]
+
+
+ENCODING_SNIFF_BYTES = 64 * 1024
+LATIN1_FALLBACK = "dukandar-latin1"
+
+
+def _latin1_fallback(err):
+    # Beech file me koi bad byte aaye to restart ki jagah wahi byte latin-1 se decode kar do
+    if isinstance(err, UnicodeDecodeError):
+        return err.object[err.start:err.end].decode("latin-1"), err.end
+    raise err
+
+
+codecs.register_error(LATIN1_FALLBACK, _latin1_fallback)
+
+
+def sniff_encoding(file_path, sample_size=ENCODING_SNIFF_BYTES):
+    with open(file_path, "rb") as f:
+        head = f.read(sample_size)
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # Sample ke end par multi-byte char kat sakta hai, woh utf-8 hi hai
+        if e.start < len(head) - 3:
+            return "latin-1"
+    return "utf-8"
+
+
+def open_statement_text(file_path):
+    enc = sniff_encoding(file_path)
+    return open(file_path, "r", encoding=enc, errors=LATIN1_FALLBACK, newline="")
+
+
+def parse_sales_csv(file_path):
+    total_sales = 0.0
+    monthly_sales = defaultdict(float)
+    try:
+        with open_statement_text(file_path) as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames:
+                raise ValueError("Sales CSV me header row nahi mila.")
+            amount_col = guess_column(reader.fieldnames, ["amount", "sale", "value", "total", "net"])
+            date_col = guess_column(reader.fieldnames, ["date", "txn date", "invoice date"])
+            if not amount_col:
+                raise ValueError("Sales CSV me amount column nahi mila.")
+            dates = DateParser()
+            for row in reader:
+                amt = clean_amount(row.get(amount_col, ""))
+                if amt <= 0:
+                    continue
+                total_sales += amt
+                d = dates.normalize(row.get(date_col, "")) if date_col else None
+                monthly_sales[month_key(d or "Unknown Date")] += amt
+    except Exception as e:
+        raise ValueError(f"Sales CSV parse failed: {e}") from e
+    return total_sales, dict(monthly_sales)
+
+
+class StatementDocument:
+    # Ek analysis me file ek hi baar khulti hai; detection, parsing aur OCR yahi page text share karte hain
+    def __init__(self, file_path, layout=None, date_format=None):
+        self.path = Path(file_path)
+        self.ext = self.path.suffix.lower()
+        self._pdf = None
+        self._texts = {}
+        self._ocr_done = set()
+        self._sample = None
+        # layout=None matlab abhi seekha nahi; {} matlab seekhne ki koshish ho chuki, mila nahi
+        self._layout = layout
+        self._date_format = date_format
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+    def close(self):
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    @property
+    def pdf(self):
+        if self._pdf is None:
+            pdfplumber = load_pdfplumber()
+            if pdfplumber is None:
+                raise ValueError("PDF support ke liye `pip install pdfplumber` required hai.")
+            self._pdf = pdfplumber.open(self.path)
+        return self._pdf
+
+    @property
+    def page_count(self):
+        return len(self.pdf.pages)
+
+    def page_text(self, i):
+        text = self._texts.get(i)
+        if text is None:
+            text = self.pdf.pages[i].extract_text() or ""
+            self._texts[i] = text
+        return text
+
+    def page_texts(self, start, stop, ocr_workers=None):
+        return self.texts_for(range(start, stop), ocr_workers)
+
+    def texts_for(self, indexes, ocr_workers=None):
+        indexes = list(indexes)
+        texts = [self.page_text(i) for i in indexes]
+        # Bina text wale (scanned) pages ek saath OCR pool me jaate hain
+        missing = [k for k, i in enumerate(indexes) if not texts[k].splitlines() and i not in self._ocr_done]
+        if missing:
+            ocr_texts = ocr_pages([self.pdf.pages[indexes[k]] for k in missing], ocr_workers)
+            for k, text in zip(missing, ocr_texts):
+                self._texts[indexes[k]] = text
+                self._ocr_done.add(indexes[k])
+                texts[k] = text
+        return texts
+
+    @property
+    def layout(self):
+        if self._layout is None:
+            self._layout = (learn_pdf_layout(self.pdf.pages[0]) if self.page_count else None) or {}
+        return self._layout or None
+
+    @property
+    def date_format(self):
+        # layout ki tarah parent me ek baar; workers ko locked format milta hai
+        if self._date_format is None:
+            n = min(DATE_LEARN_PAGES, self.page_count)
+            self._date_format = learn_date_format(self.page_texts(0, n)) or ""
+        return self._date_format or None
+
+    def page_words(self, i):
+        page = self.pdf.pages[i]
+        layout = self.layout
+        if layout:
+            # Sirf seekhe hue columns ka hissa crop karo, margin ka kachra bahar
+            left = max(0.0, layout["columns"][0][1])
+            right = min(float(page.width), layout["columns"][-1][2])
+            if left > 0 or right < page.width:
+                page = page.crop((left, 0, right, page.height))
+        return page.extract_words()
+
+    def sample_text(self):
+        if self._sample is None:
+            if self.ext == ".csv":
+                with open_statement_text(self.path) as f:
+                    self._sample = f.read(5000)
+            elif self.ext == ".pdf":
+                self._sample = "\n".join(self.page_text(i) for i in range(min(2, self.page_count)))
+            else:
+                self._sample = ""
+        return self._sample
+
+    def detect_source(self):
+        if self.ext == ".csv":
+            try:
+                return detect_bank_format_from_text(self.sample_text())
+            except Exception:
+                return "Unknown", "CSV", "low"
+        if self.ext == ".pdf" and load_pdfplumber() is not None:
+            try:
+                bank, fmt, conf = detect_bank_format_from_text(self.sample_text())
+                return bank, f"{fmt} PDF", conf
+            except Exception:
+                return "Unknown", "PDF", "low"
+        return "Unknown", "Generic", "low"
+
+
+def detect_file_source(source):
+    if isinstance(source, StatementDocument):
+        return source.detect_source()
+    with StatementDocument(source) as doc:
+        return doc.detect_source()
+
+
+def init_day_bucket():
+    return {"debit": 0.0, "credit": 0.0, "count": 0}
+
+
+def load_state():
+    default_state = {
+        "used_tries": 0,
+        "paid_unlocked": False,
+        "language": "EN",
+        "interstate": False,
+        "profiles": {
+            "Default": {
+                "gst_rate": "18",
+                "add_pct": "0",
+                "add_fixed": "0",
+                "tax_basis": "Net Credit",
+                "interstate": False,
+            }
+        },
+        "current_profile": "Default",
+        "category_rules": {},
+        "pdf_workers": "auto",
+        "report_transactions": False,
+        "report_parties": True,
+    }
+    if not STATE_FILE.exists():
+        return default_state
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        merged = dict(default_state)
+        merged["used_tries"] = int(data.get("used_tries", 0))
+        merged["paid_unlocked"] = bool(data.get("paid_unlocked", False))
+        merged["language"] = str(data.get("language", "EN")).upper()
+        merged["interstate"] = bool(data.get("interstate", False))
+        profiles = data.get("profiles")
+        if isinstance(profiles, dict) and profiles:
+            merged["profiles"] = profiles
+        merged["current_profile"] = str(data.get("current_profile", "Default"))
+        if merged["current_profile"] not in merged["profiles"]:
+            merged["current_profile"] = "Default"
+        merged["pdf_workers"] = str(data.get("pdf_workers", "auto"))
+        merged["report_transactions"] = bool(data.get("report_transactions", False))
+        merged["report_parties"] = bool(data.get("report_parties", True))
+        rules = data.get("category_rules")
+        if isinstance(rules, dict):
+            merged["category_rules"] = rules
+        return merged
+    except Exception:
+        return default_state
+
+
+def save_state(state):
+    try:
+        with open(STATE_FILE, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=True, indent=2)
+    except Exception:
+        pass
+
+
+def make_transaction(tx_date, debit, credit, description, category=None):
+    return {
+        "date": tx_date,
+        "debit": debit,
+        "credit": credit,
+        "amount": debit if debit > 0 else credit,
+        "type": "Debit" if debit > credit else "Credit",
+        "description": description,
+        "category": categorize_transaction(description) if category is None else category,
+    }
+
+
+def iter_csv_transactions(file_path):
+    try:
+        with open_statement_text(file_path) as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames:
+                raise ValueError("CSV me header row nahi mila.")
+
+            debit_col = guess_column(
+                reader.fieldnames,
+                ["debit", "withdraw", "paid", "dr", "sent", "outflow", "transfer out"]
+            )
+            credit_col = guess_column(
+                reader.fieldnames,
+                ["credit", "deposit", "received", "cr", "inflow", "transfer in", "added"]
+            )
+            amount_col = guess_column(reader.fieldnames, ["amount", "amt"])
+            type_col = guess_column(reader.fieldnames, ["type", "txn type", "transaction type", "cr/dr", "dr/cr"])
+            date_col = guess_column(reader.fieldnames, ["date", "txn date", "transaction date", "value date", "posted date"])
+            desc_col = guess_column(reader.fieldnames, ["description", "narration", "remarks", "particular", "details", "note"])
+            dates = DateParser()
+
+            for row in reader:
+                d = clean_amount(row.get(debit_col, "")) if debit_col else 0.0
+                c = clean_amount(row.get(credit_col, "")) if credit_col else 0.0
+
+                # If separate debit/credit cols not found, use amount + type
+                if d == 0.0 and c == 0.0 and amount_col:
+                    amt = clean_amount(row.get(amount_col, ""))
+                    _cat, is_debit, is_credit = classify_text(str(row.get(type_col, ""))) if type_col else ("", False, False)
+                    if is_debit:
+                        d += amt
+                    elif is_credit:
+                        c += amt
+
+                tx_date = dates.normalize(row.get(date_col, "")) if date_col else None
+                description = str(row.get(desc_col, "")).strip() if desc_col else ""
+                yield make_transaction(tx_date or "Unknown Date", d, c, description)
+    except Exception as e:
+        raise ValueError(f"CSV parse failed: {e}") from e
+
+
+def resolve_pdf_workers(workers=None):
+    if workers is None or str(workers).strip() == "":
+        workers = os.environ.get(PDF_WORKERS_ENV, "").strip()
+        if not workers:
+            # Android par process pool bharosemand nahi, wahan default sequential
+            workers = "1" if is_android_runtime() else "auto"
+    if str(workers).strip().lower() == "auto":
+        return os.cpu_count() or 1
+    try:
+        n = int(str(workers).strip())
+    except ValueError:
+        return 1
+    return n if n > 0 else (os.cpu_count() or 1)
+
+
+def _parse_pdf_lines(lines, dates):
+    transactions = []
+    tokenize = _keyword_matcher.tokenize_line
+    for line in lines:
+        # Ek scan: last amount, pehla date token, category aur debit/credit flags
+        amount, date_token, category, is_debit, is_credit = tokenize(line)
+        if amount is None or is_debit == is_credit:
+            # Bina amount ya ambiguous lines skip
+            continue
+        amt = clean_amount(amount)
+        if amt <= 0:
+            continue
+        tx_date = (dates.normalize(date_token) if date_token else None) or "Unknown Date"
+        if is_debit:
+            transactions.append(make_transaction(tx_date, amt, 0.0, line.strip(), category))
+        else:
+            transactions.append(make_transaction(tx_date, 0.0, amt, line.strip(), category))
+    return _page_result(transactions)
+
+
+def _group_word_rows(words, tolerance=PDF_ROW_TOLERANCE):
+    rows = []
+    for w in sorted(words, key=lambda w: (round(w["top"]), w["x0"])):
+        if rows and abs(w["top"] - rows[-1][0]["top"]) <= tolerance:
+            rows[-1].append(w)
+        else:
+            rows.append([w])
+    return [sorted(row, key=lambda w: w["x0"]) for row in rows]
+
+
+def _classify_header_cell(text):
+    tokens = re.findall(r"[a-z]+", text.lower())
+    if any(marker <= set(tokens) for marker in PDF_TYPE_COLUMN_TOKENS):
+        return "type"
+    for name, keywords in PDF_COLUMN_KEYWORDS:
+        for t in tokens:
+            if any(t == k or (len(k) > 3 and t.startswith(k)) for k in keywords):
+                return name
+    return "other"
+
+
+def learn_pdf_layout(page):
+    for row in _group_word_rows(page.extract_words()):
+        # Header ke words ko cells me jodo: "Txn Date", "Withdrawal Amt." ek-ek cell
+        # (do column keywords paas-paas hon to bhi alag cell: "Withdrawal Amt. Deposit Amt.")
+        cells = []
+        for w in row:
+            name = _classify_header_cell(w["text"])
+            gap_limit = 0.6 * (w["bottom"] - w["top"])
+            # "Withdrawal Amt." me "Amt." sirf qualifier hai; "Dr / Cr" me "/" ke baad wala word usi cell ka
+            if (
+                cells
+                and w["x0"] - cells[-1]["x1"] <= gap_limit
+                and (
+                    name == "other"
+                    or cells[-1]["name"] == "other"
+                    or (name == "amount" and cells[-1]["name"] in ("debit", "credit"))
+                    or cells[-1]["text"].endswith("/")
+                )
+            ):
+                cells[-1]["x1"] = w["x1"]
+                cells[-1]["text"] += " " + w["text"]
+                cells[-1]["name"] = _classify_header_cell(cells[-1]["text"])
+            else:
+                cells.append({"x0": w["x0"], "x1": w["x1"], "text": w["text"], "name": name})
+        names = [c["name"] for c in cells]
+        # Alag Debit/Credit columns, ya ek Amount + uska Dr/Cr (type) column
+        if "date" not in names or not ("debit" in names or "credit" in names or ("amount" in names and "type" in names)):
+            continue
+
+        columns = []
+        seen = set()
+        for k, (cell, name) in enumerate(zip(cells, names)):
+            left = max(0.0, cell["x0"] - 10) if k == 0 else (cells[k - 1]["x1"] + cell["x0"]) / 2
+            right = min(float(page.width), cell["x1"] + 30) if k == len(cells) - 1 else (cell["x1"] + cells[k + 1]["x0"]) / 2
+            # Do "date" columns (Txn Date, Value Dt) ho to pehla hi date maana jayega
+            if name in seen:
+                name = "other"
+            seen.add(name)
+            columns.append((name, left, right))
+        return {
+            "columns": columns,
+            "page": page.page_number - 1,
+            "header_bottom": max(w["bottom"] for w in row),
+        }
+    return None
+
+
+def _parse_pdf_table_words(words, layout, dates, min_top=None):
+    columns = layout["columns"]
+    rows = []
+    current = None
+    for row in _group_word_rows(words):
+        if min_top is not None and row[0]["top"] < min_top:
+            continue
+        cells = defaultdict(list)
+        for w in row:
+            mid = (w["x0"] + w["x1"]) / 2
+            for name, left, right in columns:
+                if left <= mid < right:
+                    cells[name].append(w["text"])
+                    break
+        narration = " ".join(cells["narration"]) if "narration" in cells else ""
+        tx_date = extract_date_from_line(" ".join(cells["date"]), dates) if cells["date"] else None
+        d = clean_amount("".join(cells["debit"])) if cells["debit"] else 0.0
+        c = clean_amount("".join(cells["credit"])) if cells["credit"] else 0.0
+        if d == 0.0 and c == 0.0 and cells["amount"] and cells["type"]:
+            # Amount + Dr/Cr layout: sign type column se (CSV parser jaisa)
+            amt = clean_amount("".join(cells["amount"]))
+            _cat, is_debit, is_credit = classify_text(" ".join(cells["type"]))
+            if is_debit and not is_credit:
+                d = amt
+            elif is_credit and not is_debit:
+                c = amt
+        if tx_date and (d > 0 or c > 0):
+            if not narration:
+                narration = " ".join(w["text"] for w in row)
+            current = [tx_date, d, c, narration]
+            rows.append(current)
+        elif current is not None and narration and not (cells["date"] or cells["debit"] or cells["credit"] or cells["amount"]):
+            # Lambi narration agli line me wrap ho jaati hai
+            current[3] = f"{current[3]} {narration}"
+        else:
+            current = None
+
+    return _page_result(make_transaction(tx_date, d, c, narration.strip()) for tx_date, d, c, narration in rows)
+
+
+def _page_result(transactions):
+    transactions = list(transactions)
+    daily = defaultdict(init_day_bucket)
+    for tx in transactions:
+        bucket = daily[tx["date"]]
+        bucket["debit"] += tx["debit"]
+        bucket["credit"] += tx["credit"]
+        bucket["count"] += 1
+    return transactions, dict(daily)
+
+
+def _parse_pdf_pages(doc, start, stop, dates, ocr_workers=None):
+    layout = doc.layout
+    if not layout:
+        return [_parse_pdf_lines(text.splitlines(), dates) for text in doc.page_texts(start, stop, ocr_workers)]
+    # Layout pehchana gaya: columns se seedha debit/credit, balance column kabhi amount nahi banta
+    pages = []
+    fallback = []
+    for i in range(start, stop):
+        words = doc.page_words(i)
+        page = None
+        if words:
+            min_top = layout["header_bottom"] if i == layout["page"] else None
+            page = _parse_pdf_table_words(words, layout, dates, min_top)
+        if not page or not page[0]:
+            # Layout galat pehchana ho / page alag format ka ho to purana line heuristic
+            fallback.append(i - start)
+        pages.append(page)
+    if fallback:
+        # Scanned pages ka OCR ek hi batch me (page-by-page nahi), phir parse
+        texts = doc.texts_for([start + k for k in fallback], ocr_workers)
+        for k, text in zip(fallback, texts):
+            pages[k] = _parse_pdf_lines(text.splitlines(), dates)
+    return pages
+
+
+def _parse_pdf_page_range(file_path, start, stop, custom_rules, ocr_workers, layout, date_format):
+    # Worker process: PDF khud kholta hai, parent se sirf path, page range, seekha hua layout aur date format aata hai
+    if custom_rules:
+        set_custom_category_rules(custom_rules)
+    reset_ocr_stats()
+    dates = DateParser(locked=date_format)
+    with StatementDocument(file_path, layout=layout, date_format=date_format or "") as doc:
+        pages = _parse_pdf_pages(doc, start, stop, dates, ocr_workers)
+    return pages, ocr_cache_stats()
+
+
+def _iter_pdf_pages_sequential(doc):
+    dates = DateParser(locked=doc.date_format)
+    for start in range(0, doc.page_count, OCR_BATCH_PAGES):
+        yield from _parse_pdf_pages(doc, start, min(start + OCR_BATCH_PAGES, doc.page_count), dates)
+
+
+def iter_pdf_pages(source, workers=None, progress=None):
+    if load_pdfplumber() is None:
+        raise ValueError("PDF support ke liye `pip install pdfplumber` required hai.")
+
+    owned = not isinstance(source, StatementDocument)
+    doc = StatementDocument(source) if owned else source
+    misses_before = ocr_cache_stats()["misses"]
+    try:
+        pages = _iter_pdf_pages(doc, resolve_pdf_workers(workers))
+        if progress is None:
+            yield from pages
+        else:
+            # progress() JobCancelled raise kare to generator yahin band; finally me cleanup
+            total = doc.page_count
+            progress("pages", 0, total)
+            for done, page in enumerate(pages, 1):
+                progress("pages", done, total)
+                yield page
+    finally:
+        if owned:
+            doc.close()
+    if ocr_cache_stats()["misses"] > misses_before:
+        prune_ocr_cache()
+
+
+def _iter_pdf_pages(doc, workers):
+    page_count = doc.page_count
+    if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+        yield from _iter_pdf_pages_sequential(doc)
+        return
+
+    # Chhote chunks taaki OCR wale bhaari pages ek hi worker par na atak jayein
+    chunk = max(1, -(-page_count // (workers * 4)))
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    # Har process apne OCR threads chalata hai; total CPU se zyada na ho
+    ocr_workers = max(1, resolve_ocr_workers() // workers)
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
+    except (OSError, NotImplementedError, ImportError):
+        yield from _iter_pdf_pages_sequential(doc)
+        return
+    with pool:
+        futures = [
+            pool.submit(
+                _parse_pdf_page_range, str(doc.path), start, stop, _custom_category_rules, ocr_workers,
+                doc.layout or {}, doc.date_format
+            )
+            for start, stop in ranges
+        ]
+        try:
+            for fut in futures:
+                pages, worker_stats = fut.result()
+                _bump_ocr_stats(**worker_stats)
+                yield from pages
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+
+def iter_pdf_transactions(source, workers=None, progress=None):
+    for page_transactions, _daily in iter_pdf_pages(source, workers, progress):
+        yield from page_transactions
+
+
+def iter_transactions(source, workers=None, progress=None):
+    if isinstance(source, StatementDocument):
+        file_path, ext = source.path, source.ext
+    else:
+        file_path, ext = source, Path(source).suffix.lower()
+    if ext == ".csv":
+        return iter_csv_transactions(file_path)
+    if ext == ".pdf":
+        return iter_pdf_transactions(source, workers, progress)
+    raise ValueError("Sirf CSV/PDF supported hai.")
+
+
+def consume_transactions(transactions, *aggregators):
+    # Ek hi pass me saare aggregators ko feed karo, list banane ki zaroorat nahi
+    for tx in transactions:
+        for agg in aggregators:
+            agg.add(tx)
+    return aggregators
+
+
+def _collect_statement(transactions):
+    summary = StatementSummary()
+    kept = []
+    for tx in transactions:
+        summary.add(tx)
+        kept.append(tx)
+    return summary.total_debit, summary.total_credit, summary.rows_count, dict(summary.daily), kept
+
+
+def parse_csv_statement(file_path):
+    return _collect_statement(iter_csv_transactions(file_path))
+
+
+def parse_pdf_statement(source, workers=None):
+    daily = defaultdict(init_day_bucket)
+    transactions = []
+    for page_transactions, page_daily in iter_pdf_pages(source, workers):
+        transactions.extend(page_transactions)
+        for day, bucket in page_daily.items():
+            daily[day]["debit"] += bucket["debit"]
+            daily[day]["credit"] += bucket["credit"]
+            daily[day]["count"] += bucket["count"]
+    total_debit = sum(b["debit"] for b in daily.values())
+    total_credit = sum(b["credit"] for b in daily.values())
+    return total_debit, total_credit, len(transactions), dict(daily), transactions
+
+
+TX_TYPES = ("Debit", "Credit")
+UNKNOWN_DAY = 0
+
+
+def day_ordinal(date_str):
+    d = to_date_obj(date_str)
+    return d.toordinal() if d else UNKNOWN_DAY
+
+
+@lru_cache(maxsize=8192)
+def day_label(ordinal):
+    if ordinal == UNKNOWN_DAY:
+        return "Unknown Date"
+    return date.fromordinal(ordinal).isoformat()
+
+
+class TransactionRow:
+    # Purane dict-based code ke liye read-only view: tx.get("amount") jaisa hi chalta hai
+    __slots__ = ("table", "index")
+    KEYS = ("date", "debit", "credit", "amount", "type", "description", "category")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key):
+        t, i = self.table, self.index
+        if key == "date":
+            return day_label(t.days[i])
+        if key == "debit":
+            return t.debit[i] / 100.0
+        if key == "credit":
+            return t.credit[i] / 100.0
+        if key == "amount":
+            return t.amount_paise(i) / 100.0
+        if key == "type":
+            return TX_TYPES[t.types[i]]
+        if key == "description":
+            return t.descriptions[i]
+        if key == "category":
+            return t.category_names[t.categories[i]]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.KEYS
+
+    def to_dict(self):
+        return {k: self[k] for k in self.KEYS}
+
+
+class TransactionTable:
+    def __init__(self):
+        self.days = array("i")
+        self.debit = array("q")
+        self.credit = array("q")
+        self.types = array("b")
+        self.categories = array("H")
+        self.category_names = []
+        self.category_codes = {}
+        self.descriptions = []
+        self._date_index = None
+        self._aggregate_cube = None
+        self._party_names = None
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        table = cls()
+        for tx in transactions:
+            table.add(tx)
+        return table
+
+    def category_code(self, name):
+        code = self.category_codes.get(name)
+        if code is None:
+            code = len(self.category_names)
+            if code >= 1 << (8 * self.categories.itemsize):
+                raise ValueError(f"Bahut zyada categories ({code}); '{name}' ke liye code nahi bacha")
+            self.category_names.append(name)
+            self.category_codes[name] = code
+        return code
+
+    def add(self, tx):
+        self.days.append(day_ordinal(tx.get("date")))
+        self.debit.append(to_paise(tx.get("debit", 0.0)))
+        self.credit.append(to_paise(tx.get("credit", 0.0)))
+        self.types.append(0 if tx.get("type") == "Debit" else 1)
+        self.categories.append(self.category_code(tx.get("category") or "Other"))
+        self.descriptions.append(tx.get("description") or "")
+
+    def amount_paise(self, i):
+        d = self.debit[i]
+        return d if d > 0 else self.credit[i]
+
+    def take(self, indexes):
+        out = TransactionTable()
+        out.category_names = list(self.category_names)
+        out.category_codes = dict(self.category_codes)
+        indexes = list(indexes)
+        for name in ("days", "debit", "credit", "types", "categories"):
+            col = getattr(self, name)
+            getattr(out, name).extend(col[i] for i in indexes)
+        descriptions = self.descriptions
+        out.descriptions = [descriptions[i] for i in indexes]
+        return out
+
+    def date_index(self):
+        # Table sirf append hoti hai, isliye size badla ho tabhi index dobara banao
+        if self._date_index is None or self._date_index.size != len(self):
+            self._date_index = DateIndex(self)
+        return self._date_index
+
+    def aggregate_cube(self):
+        if self._aggregate_cube is None or self._aggregate_cube.size != len(self):
+            self._aggregate_cube = AggregateCube(self)
+        return self._aggregate_cube
+
+    def party_names(self):
+        # Har row ka party naam ek baar (interned); ledger/filters isi column ko reuse karte hain
+        if self._party_names is None or len(self._party_names) != len(self):
+            self._party_names = [party_from_description(d) for d in self.descriptions]
+        return self._party_names
+
+    def to_bytes(self):
+        cols = (self.days, self.debit, self.credit, self.types, self.categories)
+        header = json.dumps(
+            {
+                "rows": len(self),
+                "byteorder": sys.byteorder,
+                "itemsizes": [c.itemsize for c in cols],
+                "categories": self.category_names,
+            }
+        ).encode("utf-8")
+        desc = "\x00".join(d.replace("\x00", " ") for d in self.descriptions).encode("utf-8")
+        body = b"".join([c.tobytes() for c in cols] + [desc])
+        return struct.pack("<I", len(header)) + header + zlib.compress(body, 1)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        (head_len,) = struct.unpack_from("<I", blob)
+        header = json.loads(blob[4:4 + head_len].decode("utf-8"))
+        body = zlib.decompress(blob[4 + head_len:])
+        table = cls()
+        cols = (table.days, table.debit, table.credit, table.types, table.categories)
+        if header["byteorder"] != sys.byteorder or header["itemsizes"] != [c.itemsize for c in cols]:
+            raise ValueError("Cache kisi aur machine ka hai")
+        n = header["rows"]
+        pos = 0
+        for col in cols:
+            size = n * col.itemsize
+            col.frombytes(body[pos:pos + size])
+            pos += size
+        table.descriptions = body[pos:].decode("utf-8").split("\x00") if n else []
+        table.category_names = list(header["categories"])
+        table.category_codes = {name: i for i, name in enumerate(table.category_names)}
+        if len(table.descriptions) != n:
+            raise ValueError("Cache file corrupt hai")
+        return table
+
+    def __len__(self):
+        return len(self.days)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return TransactionRow(self, i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield TransactionRow(self, i)
+
+
+class DateIndex:
+    # Rows day ordinal se sorted; har From/To query sirf do bisect + slice
+    def __init__(self, table):
+        days = table.days
+        order = sorted((i for i in range(len(days)) if days[i] != UNKNOWN_DAY), key=days.__getitem__)
+        self.table = table
+        self.size = len(days)
+        self.order = array("i", order)
+        self.days = array("i", (days[i] for i in order))
+        self.unknown = array("i", (i for i in range(len(days)) if days[i] == UNKNOWN_DAY))
+
+    def bounds(self, from_date=None, to_date=None):
+        lo = bisect_left(self.days, from_date.toordinal()) if from_date else 0
+        hi = bisect_right(self.days, to_date.toordinal()) if to_date else len(self.days)
+        return lo, max(lo, hi)
+
+    def indexes(self, from_date=None, to_date=None):
+        if not from_date and not to_date:
+            return range(self.size)
+        lo, hi = self.bounds(from_date, to_date)
+        # Statement ka original order wapas
+        return sorted(self.order[lo:hi])
+
+    def select(self, from_date=None, to_date=None):
+        return self.table.take(self.indexes(from_date, to_date))
+
+
+class AggregateCube:
+    # Day x category x (debit, credit, count) ke prefix sums (paise me).
+    # Kisi bhi From/To window ka total do lookups ka fark hai; rows dobara nahi chhune padte
+    def __init__(self, table):
+        days, debit, credit, cats = table.days, table.debit, table.credit, table.categories
+        self.size = len(days)
+        self.category_names = list(table.category_names)
+        n_cat = max(1, len(self.category_names))
+        self.ordinals = array("i", sorted({d for d in days if d != UNKNOWN_DAY}))
+        n_days = len(self.ordinals)
+        day_pos = {d: p for p, d in enumerate(self.ordinals)}
+
+        # Aakhri row "Unknown Date" wali rows ke liye (prefix me shamil nahi)
+        cells = [[0, 0, 0] for _ in range((n_days + 1) * n_cat)]
+        for i in range(self.size):
+            cell = cells[day_pos.get(days[i], n_days) * n_cat + cats[i]]
+            cell[0] += debit[i]
+            cell[1] += credit[i]
+            cell[2] += 1
+        self.unknown = cells[n_days * n_cat:]
+
+        # Row p = pehle p dino ka total; per-category aur per-day dono
+        self.cat_debit = array("q", [0] * n_cat)
+        self.cat_credit = array("q", [0] * n_cat)
+        self.cat_count = array("q", [0] * n_cat)
+        self.day_debit = array("q", [0])
+        self.day_credit = array("q", [0])
+        self.day_count = array("q", [0])
+        for p in range(n_days):
+            base = p * n_cat
+            td = tc = tn = 0
+            for k in range(n_cat):
+                d, c, n = cells[base + k]
+                self.cat_debit.append(self.cat_debit[base + k] + d)
+                self.cat_credit.append(self.cat_credit[base + k] + c)
+                self.cat_count.append(self.cat_count[base + k] + n)
+                td += d
+                tc += c
+                tn += n
+            self.day_debit.append(self.day_debit[p] + td)
+            self.day_credit.append(self.day_credit[p] + tc)
+            self.day_count.append(self.day_count[p] + tn)
+        self.n_cat = n_cat
+
+        # Har mahine ki pehli day position, monthly rollup ke liye
+        self.months = []
+        for p, ordinal in enumerate(self.ordinals):
+            key = month_key(day_label(ordinal))
+            if not self.months or self.months[-1][0] != key:
+                self.months.append((key, p))
+
+    def window(self, from_date=None, to_date=None):
+        lo = bisect_left(self.ordinals, from_date.toordinal()) if from_date else 0
+        hi = bisect_right(self.ordinals, to_date.toordinal()) if to_date else len(self.ordinals)
+        # filter_transactions jaisa: koi bhi bound ho to Unknown Date rows bahar
+        return lo, max(lo, hi), not from_date and not to_date
+
+    def _span(self, lo, hi):
+        return (
+            self.day_debit[hi] - self.day_debit[lo],
+            self.day_credit[hi] - self.day_credit[lo],
+            self.day_count[hi] - self.day_count[lo],
+        )
+
+    def totals(self, from_date=None, to_date=None):
+        lo, hi, with_unknown = self.window(from_date, to_date)
+        d, c, n = self._span(lo, hi)
+        if with_unknown:
+            for ud, uc, un in self.unknown:
+                d, c, n = d + ud, c + uc, n + un
+        return Money(d), Money(c), n
+
+    def category_totals(self, from_date=None, to_date=None):
+        lo, hi, with_unknown = self.window(from_date, to_date)
+        lo, hi = lo * self.n_cat, hi * self.n_cat
+        out = {}
+        for k, name in enumerate(self.category_names):
+            n = self.cat_count[hi + k] - self.cat_count[lo + k]
+            paise = (self.cat_debit[hi + k] - self.cat_debit[lo + k]) + (self.cat_credit[hi + k] - self.cat_credit[lo + k])
+            if with_unknown:
+                ud, uc, un = self.unknown[k]
+                n += un
+                paise += ud + uc
+            if n:
+                out[name] = Money(paise)
+        return out
+
+    def daily(self, from_date=None, to_date=None):
+        lo, hi, with_unknown = self.window(from_date, to_date)
+        out = {}
+        for p in range(lo, hi):
+            d, c, n = self._span(p, p + 1)
+            out[day_label(self.ordinals[p])] = {"debit": d / 100.0, "credit": c / 100.0, "count": n}
+        if with_unknown:
+            self._add_unknown(out, day_label(UNKNOWN_DAY))
+        return out
+
+    def monthly(self, from_date=None, to_date=None):
+        lo, hi, with_unknown = self.window(from_date, to_date)
+        out = {}
+        for m, (key, start) in enumerate(self.months):
+            stop = self.months[m + 1][1] if m + 1 < len(self.months) else len(self.ordinals)
+            start, stop = max(start, lo), min(stop, hi)
+            if start < stop:
+                d, c, n = self._span(start, stop)
+                out[key] = {"debit": d / 100.0, "credit": c / 100.0, "count": n}
+        if with_unknown:
+            self._add_unknown(out, month_key(day_label(UNKNOWN_DAY)))
+        return out
+
+    def _add_unknown(self, out, key):
+        d = sum(u[0] for u in self.unknown)
+        c = sum(u[1] for u in self.unknown)
+        n = sum(u[2] for u in self.unknown)
+        if n:
+            out[key] = {"debit": d / 100.0, "credit": c / 100.0, "count": n}
+
+    def summary(self, from_date=None, to_date=None):
+        # summarize_transactions() wala hi tuple
+        d, c, _n = self.totals(from_date, to_date)
+        categories = {k: float(v) for k, v in self.category_totals(from_date, to_date).items()}
+        return float(d), float(c), self.daily(from_date, to_date), self.monthly(from_date, to_date), categories
+
+    def tax(self, gst_rate, add_pct, add_fixed, basis, from_date=None, to_date=None):
+        d, c, _n = self.totals(from_date, to_date)
+        return calculate_tax(d, c, gst_rate, add_pct, add_fixed, basis)
+
+    def gstr_summary(self, gst_rate, interstate, from_date=None, to_date=None):
+        d, c, _n = self.totals(from_date, to_date)
+        return build_gstr_summary(d, c, gst_rate, interstate)
+
+    def suggest_gst_rate(self, from_date=None, to_date=None):
+        return suggest_gst_rate_from_categories(self.category_totals(from_date, to_date))
+
+
+PARSE_CACHE_MAGIC = b"DKTT6"
+
+
+def file_digest(file_path):
+    h = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _parse_cache_path(file_path):
+    st = os.stat(file_path)
+    key = "|".join(
+        [
+            PARSE_CACHE_MAGIC.decode("ascii"),
+            str(Path(file_path).resolve()),
+            str(st.st_size),
+            str(st.st_mtime_ns),
+            _keyword_matcher.signature,
+        ]
+    )
+    return PARSE_CACHE_DIR / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".bin")
+
+
+def load_cached_table(file_path):
+    try:
+        cache_path = _parse_cache_path(file_path)
+        if not cache_path.exists():
+            return None
+        blob = cache_path.read_bytes()
+        magic_len = len(PARSE_CACHE_MAGIC)
+        if blob[:magic_len] != PARSE_CACHE_MAGIC:
+            return None
+        # mtime same ho par content badla ho (copy/restore) to bhi pakad lo
+        digest = blob[magic_len:magic_len + 40].decode("ascii")
+        if digest != file_digest(file_path):
+            return None
+        table = TransactionTable.from_bytes(blob[magic_len + 40:])
+        os.utime(cache_path)
+        return table
+    except Exception:
+        return None
+
+
+def store_cached_table(file_path, table):
+    try:
+        PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path = _parse_cache_path(file_path)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(PARSE_CACHE_MAGIC)
+            f.write(file_digest(file_path).encode("ascii"))
+            f.write(table.to_bytes())
+        os.replace(tmp_path, cache_path)
+        prune_parse_cache()
+    except Exception as e:
+        log_error(e)
+
+
+def _prune_cache_dir(cache_dir, pattern, max_bytes, max_age_days):
+    if not cache_dir.exists():
+        return
+    now = time.time()
+    entries = []
+    for p in cache_dir.glob(pattern):
+        try:
+            st = p.stat()
+            if now - st.st_mtime > max_age_days * 86400:
+                p.unlink()
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        except OSError:
+            continue
+    total = sum(size for _mtime, size, _p in entries)
+    # Sabse purane (kam use hue) pehle hatao jab tak size limit ke andar na aa jaye
+    for _mtime, size, p in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            p.unlink()
+            total -= size
+        except OSError:
+            continue
+
+
+def prune_parse_cache(max_bytes=PARSE_CACHE_MAX_BYTES, max_age_days=PARSE_CACHE_MAX_AGE_DAYS):
+    _prune_cache_dir(PARSE_CACHE_DIR, "*.bin", max_bytes, max_age_days)
+
+
+def prune_ocr_cache(max_bytes=OCR_CACHE_MAX_BYTES, max_age_days=OCR_CACHE_MAX_AGE_DAYS):
+    _prune_cache_dir(OCR_CACHE_DIR, "*.txt", max_bytes, max_age_days)
+
+
+def load_transaction_table(source, use_cache=True, workers=None, progress=None, aggregators=()):
+    # progress(stage, done, total): PDF par har page, CSV par har PROGRESS_EVERY_ROWS rows.
+    # aggregators: parse ke saath hi har row feed (partial totals progress ke beech dikh sakein)
+    file_path = source.path if isinstance(source, StatementDocument) else source
+    if use_cache:
+        table = load_cached_table(file_path)
+        if table is not None:
+            if aggregators:
+                consume_transactions(table, *aggregators)
+            if progress is not None:
+                progress("cache", len(table), len(table))
+            return table
+    table = TransactionTable()
+    for tx in iter_transactions(source, workers, progress):
+        table.add(tx)
+        for agg in aggregators:
+            agg.add(tx)
+        if progress is not None and len(table) % PROGRESS_EVERY_ROWS == 0:
+            progress("rows", len(table), None)
+    if use_cache:
+        store_cached_table(file_path, table)
+    return table
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class AnalysisJob:
+    # Lamba kaam worker thread par; UI thread poll() se events leta hai (Tk after() / Kivy Clock).
+    # Events: ("progress", stage, (done, total)), ("result", name, value), ("done"|"cancelled"|"error", None, err)
+    def __init__(self, work, *args):
+        self._work = work
+        self._args = args
+        self._cancel = threading.Event()
+        self.events = queue.Queue()
+        self.finished = False
+        self.thread = threading.Thread(target=self._run, name="dukandar-analysis", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def progress(self, stage, done, total=None):
+        self.check()
+        self.events.put(("progress", stage, (done, total)))
+
+    def emit(self, name, value):
+        self.check()
+        self.events.put(("result", name, value))
+
+    def _run(self):
+        try:
+            self._work(self, *self._args)
+        except JobCancelled:
+            self.events.put(("cancelled", None, None))
+        except Exception as e:
+            log_error(e)
+            self.events.put(("error", None, e))
+        else:
+            self.events.put(("done", None, None))
+
+    def poll(self, limit=200):
+        out = []
+        while len(out) < limit:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            out.append(event)
+            if event[0] in ("done", "cancelled", "error"):
+                self.finished = True
+        return out
+
+
+def calculate_tax(total_debit, total_credit, gst_rate, add_pct, add_fixed, basis):
+    total_debit = Money.of(total_debit)
+    total_credit = Money.of(total_credit)
+    if basis == "Credit":
+        taxable = total_credit
+    elif basis == "Debit":
+        taxable = total_debit
+    else:  # Net Credit
+        taxable = max(total_credit - total_debit, Money(0))
+
+    gst = taxable.percent(gst_rate)
+    additional = taxable.percent(add_pct) + Money.of(add_fixed)
+    total_payable = gst + additional
+
+    return taxable, gst, additional, total_payable
+
+
+def gst_split(gst_amount, interstate=False):
+    gst_amount = Money.of(gst_amount)
+    if interstate:
+        return Money(0), Money(0), gst_amount
+    # Odd paise ho to CGST+SGST ka total phir bhi GST ke barabar rahe
+    cgst, sgst = gst_amount.split_half()
+    return cgst, sgst, Money(0)
+
+
+def filter_transactions(transactions, from_date=None, to_date=None):
+    if isinstance(transactions, TransactionTable):
+        return transactions.date_index().select(from_date, to_date)
+    out = []
+    for tx in transactions:
+        d = to_date_obj(tx.get("date"))
+        if from_date and (d is None or d < from_date):
+            continue
+        if to_date and (d is None or d > to_date):
+            continue
+        out.append(tx)
+    return out
+
+
+class StatementSummary:
+    def __init__(self):
+        self.total_debit = 0.0
+        self.total_credit = 0.0
+        self.rows_count = 0
+        self.daily = defaultdict(init_day_bucket)
+        self.monthly = defaultdict(init_day_bucket)
+        self.categories = defaultdict(float)
+
+    def add(self, tx):
+        d = float(tx.get("debit", 0.0))
+        c = float(tx.get("credit", 0.0))
+        day = tx.get("date") or "Unknown Date"
+        mon = month_key(day)
+        cat = tx.get("category") or "Other"
+        self.rows_count += 1
+        self.total_debit += d
+        self.total_credit += c
+        self.daily[day]["debit"] += d
+        self.daily[day]["credit"] += c
+        self.daily[day]["count"] += 1
+        self.monthly[mon]["debit"] += d
+        self.monthly[mon]["credit"] += c
+        self.monthly[mon]["count"] += 1
+        self.categories[cat] += d + c
+
+    def tax(self, gst_rate, add_pct, add_fixed, basis):
+        return calculate_tax(self.total_debit, self.total_credit, gst_rate, add_pct, add_fixed, basis)
+
+    def result(self):
+        return self.total_debit, self.total_credit, dict(self.daily), dict(self.monthly), dict(self.categories)
+
+
+def summarize_transactions(transactions):
+    if isinstance(transactions, TransactionTable):
+        return transactions.aggregate_cube().summary()
+    summary = StatementSummary()
+    consume_transactions(transactions, summary)
+    return summary.result()
+
+
+class DuplicateDetector:
+    def __init__(self):
+        self.seen = {}
+        self.groups = {}
+        self.index = 0
+
+    def add(self, tx):
+        sig = (
+            tx.get("date"),
+            to_paise(tx.get("amount", 0.0)),
+            tx.get("type"),
+            (tx.get("description") or "").strip().lower(),
+        )
+        first = self.seen.get(sig)
+        if first is None:
+            # Pehli baar sirf (position, txn) yaad rakho; group tabhi banta hai jab dobara aaye
+            self.seen[sig] = (self.index, tx)
+        elif sig in self.groups:
+            self.groups[sig].append(tx)
+        else:
+            self.groups[sig] = [first[1], tx]
+        self.index += 1
+
+    def result(self):
+        out = []
+        for sig in sorted(self.groups, key=lambda k: self.seen[k][0]):
+            out.extend(self.groups[sig])
+        return out
+
+
+def detect_duplicates(transactions):
+    if isinstance(transactions, TransactionTable):
+        seen = {}
+        t = transactions
+        for i in range(len(t)):
+            sig = (t.days[i], t.amount_paise(i), t.types[i], t.descriptions[i].strip().lower())
+            seen.setdefault(sig, []).append(i)
+        return [t[i] for idxs in seen.values() if len(idxs) > 1 for i in idxs]
+    detector = DuplicateDetector()
+    consume_transactions(transactions, detector)
+    return detector.result()
+
+
+_REF_DIGITS_REGEX = re.compile(r"\d{4,}")
+_NON_WORD_REGEX = re.compile(r"[^a-z0-9#]+")
+
+
+@lru_cache(maxsize=65536)
+def description_shingles(description):
+    # Lambe number (UTR/ref) "#" ban jate hain, punctuation/space normalize; phir 3-char shingles
+    text = _REF_DIGITS_REGEX.sub("#", (description or "").lower())
+    text = " ".join(_NON_WORD_REGEX.sub(" ", text).split())
+    if len(text) < 3:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def shingle_similarity(a, b):
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+class DuplicateEngine:
+    # Near-duplicates: same amount + type ke bucket, usme day window ke andar hi description compare.
+    # Har row sirf apne pichhle max_candidates padosiyon se milti hai, isliye kaam ~O(n)
+    def __init__(self, day_window=DUPLICATE_DAY_WINDOW, min_similarity=DUPLICATE_MIN_SIMILARITY,
+                 max_candidates=DUPLICATE_MAX_CANDIDATES):
+        self.day_window = day_window
+        self.min_similarity = min_similarity
+        self.max_candidates = max_candidates
+        self.table = TransactionTable()
+
+    def add(self, tx):
+        self.table.add(tx)
+
+    def result(self):
+        return self.clusters(self.table)
+
+    def clusters(self, table):
+        days, descriptions = table.days, table.descriptions
+        buckets = defaultdict(list)
+        for i in range(len(table)):
+            buckets[(table.amount_paise(i), table.types[i])].append(i)
+
+        parent = {}
+        weakest = {}
+
+        def find(i):
+            root = i
+            while parent[root] != root:
+                root = parent[root]
+            while parent[i] != root:
+                parent[i], i = root, parent[i]
+            return root
+
+        for idxs in buckets.values():
+            if len(idxs) < 2:
+                continue
+            idxs.sort(key=days.__getitem__)
+            start = 0
+            for pos, i in enumerate(idxs):
+                while days[idxs[start]] < days[i] - self.day_window:
+                    start += 1
+                sig = description_shingles(descriptions[i])
+                for j in idxs[max(start, pos - self.max_candidates):pos]:
+                    sim = shingle_similarity(sig, description_shingles(descriptions[j]))
+                    if sim < self.min_similarity:
+                        continue
+                    for k in (i, j):
+                        if k not in parent:
+                            parent[k] = k
+                            weakest[k] = 1.0
+                    ri, rj = find(i), find(j)
+                    if ri != rj:
+                        parent[ri] = rj
+                        weakest[rj] = min(weakest[rj], weakest.pop(ri), sim)
+
+        groups = defaultdict(list)
+        for i in parent:
+            groups[find(i)].append(i)
+        out = []
+        for root, members in groups.items():
+            members.sort()
+            known = [days[i] for i in members if days[i] != UNKNOWN_DAY]
+            out.append({
+                "rows": [table[i] for i in members],
+                "similarity": round(weakest[root], 3),
+                "day_span": max(known) - min(known) if known else 0,
+                "amount": Money(table.amount_paise(members[0])),
+            })
+        out.sort(key=lambda c: c["rows"][0].index)
+        return out
+
+
+def find_duplicate_clusters(transactions, day_window=DUPLICATE_DAY_WINDOW,
+                            min_similarity=DUPLICATE_MIN_SIMILARITY):
+    engine = DuplicateEngine(day_window, min_similarity)
+    if isinstance(transactions, TransactionTable):
+        return engine.clusters(transactions)
+    consume_transactions(transactions, engine)
+    return engine.result()
+
+
+class RiskRule:
+    __slots__ = ("name", "score", "reason", "alert", "checks", "round_trip")
+
+    def __init__(self, spec):
+        self.name = spec.get("name", "rule")
+        self.score = int(spec.get("score", 0))
+        self.reason = spec.get("reason") or self.name
+        self.alert = spec.get("alert")
+        # Round-trip rules pairs par chalte hain, isliye sirf alert dete hain (score nahi)
+        round_trip = spec.get("round_trip")
+        if isinstance(round_trip, dict):
+            self.round_trip = (
+                int(round_trip.get("day_window", ROUND_TRIP_DAY_WINDOW)),
+                float(round_trip.get("tolerance_pct", ROUND_TRIP_TOLERANCE_PCT)),
+            )
+        else:
+            self.round_trip = (ROUND_TRIP_DAY_WINDOW, ROUND_TRIP_TOLERANCE_PCT) if round_trip else None
+        # Har condition ek chhota check (day, paise, desc_lower) par; config se ek hi baar banta hai
+        checks = []
+        if spec.get("min_amount") is not None:
+            min_paise = to_paise(spec["min_amount"])
+            checks.append(lambda day, paise, desc: paise >= min_paise)
+        terms = [str(t).strip().lower() for t in spec.get("terms") or () if str(t).strip()]
+        if terms:
+            term_regex = re.compile("|".join(re.escape(t) for t in terms))
+            checks.append(lambda day, paise, desc: term_regex.search(desc) is not None)
+        if spec.get("unknown_date") is not None:
+            want_unknown = bool(spec["unknown_date"])
+            checks.append(lambda day, paise, desc: (day == UNKNOWN_DAY) == want_unknown)
+        if spec.get("max_description_length") is not None:
+            max_len = int(spec["max_description_length"])
+            checks.append(lambda day, paise, desc: len(desc.strip()) <= max_len)
+        self.checks = tuple(checks)
+
+
+def compile_risk_rules(specs):
+    return [RiskRule(spec) for spec in specs]
+
+
+_risk_rules = compile_risk_rules(RISK_RULES)
+
+
+class RiskEngine:
+    # Ek pass: har row par saare rules; alerts (set) aur per-row score dono saath bante hain
+    def __init__(self, rules=None, keep_scores=True):
+        self.rules = _risk_rules if rules is None else rules
+        self.keep_scores = keep_scores
+        self.alerts = set()
+        self.scored = []
+        self._round_trip = defaultdict(list)
+
+    def add(self, tx):
+        day = day_ordinal(tx.get("date"))
+        self._evaluate(
+            day,
+            to_paise(tx.get("amount", 0.0)),
+            0 if tx.get("type") == "Debit" else 1,
+            tx.get("description") or "",
+            tx.get("date") or day_label(day),
+        )
+
+    def add_table(self, table):
+        days, types, descriptions = table.days, table.types, table.descriptions
+        for i in range(len(table)):
+            self._evaluate(days[i], table.amount_paise(i), types[i], descriptions[i], day_label(days[i]))
+        return self
+
+    def _evaluate(self, day, paise, type_code, description, date_label):
+        desc = description.lower()
+        score = 0
+        reasons = []
+        for rule in self.rules:
+            for check in rule.checks:
+                if not check(day, paise, desc):
+                    break
+            else:
+                if rule.round_trip:
+                    if day != UNKNOWN_DAY:
+                        self._round_trip[rule].append((paise, day, type_code))
+                    continue
+                if rule.score:
+                    score += rule.score
+                    reasons.append(rule.reason)
+                if rule.alert:
+                    self.alerts.add(rule.alert.format(date=date_label, amount=money(Money(paise)), type=TX_TYPES[type_code]))
+        if not self.keep_scores:
+            return
+        self.scored.append(
+            {
+                "date": date_label,
+                "type": TX_TYPES[type_code],
+                "amount": paise / 100.0,
+                "description": description,
+                "score": min(score, 100),
+                "reasons": ", ".join(reasons) if reasons else "Normal",
+            }
+        )
+
+    def result(self):
+        for rule, entries in self._round_trip.items():
+            day_window, tolerance_pct = rule.round_trip
+            for debit, credit, _gap in sweep_round_trips(entries, day_window, tolerance_pct):
+                kind = round_trip_kind(debit[1], credit[1])
+                self.alerts.add(rule.alert.format(
+                    kind="Round-trip" if kind == "round_trip" else "Layering",
+                    date=day_label(min(debit[1], credit[1])),
+                    amount=money(Money(debit[0])),
+                    type=TX_TYPES[0],
+                    days_apart=abs(credit[1] - debit[1]),
+                ))
+        self._round_trip.clear()
+        return sorted(self.alerts), sorted(self.scored, key=lambda x: x["score"], reverse=True)
+
+
+def sweep_round_trips(entries, day_window=ROUND_TRIP_DAY_WINDOW, tolerance_pct=ROUND_TRIP_TOLERANCE_PCT):
+    # entries: (paise, day, type_code, ...). Debits amount order me; credits ek pointer se "active"
+    # hote hain jab tak amount debit + tolerance tak hai, aur day-wise bucket me amount order me rehte hain.
+    # Har debit sirf apne +-N din ke buckets me bisect karta hai: kul O(n log n)
+    debits = sorted((e for e in entries if e[2] == 0), key=lambda e: (e[0], e[1]))
+    credits = sorted((e for e in entries if e[2] == 1), key=lambda e: (e[0], e[1]))
+    offsets = sorted(range(-day_window, day_window + 1), key=lambda o: (abs(o), -o))
+    pending = defaultdict(list)
+    pairs = []
+    c = 0
+    for debit in debits:
+        paise, day = debit[0], debit[1]
+        tolerance = paise * tolerance_pct / 100.0
+        while c < len(credits) and credits[c][0] <= paise + tolerance:
+            pending[credits[c][1]].append((credits[c][0], c))
+            c += 1
+        best = None
+        for offset in offsets:
+            bucket = pending.get(day + offset)
+            if not bucket:
+                continue
+            k = bisect_left(bucket, (paise, -1))
+            for j in (k - 1, k):
+                if 0 <= j < len(bucket):
+                    gap = abs(bucket[j][0] - paise)
+                    if gap <= tolerance and (best is None or gap < best[0]):
+                        best = (gap, bucket, j)
+            if best is not None:
+                # Sabse paas wala din pehle; usme sabse kam amount gap
+                break
+        if best is not None:
+            gap, bucket, j = best
+            _amount, ci = bucket.pop(j)
+            pairs.append((debit, credits[ci], gap))
+    return pairs
+
+
+def round_trip_kind(debit_day, credit_day):
+    # Paisa gaya aur wapas aaya = round trip; pehle aaya phir aage gaya = layering (pass-through)
+    return "round_trip" if credit_day >= debit_day else "layering"
+
+
+def find_round_trips(transactions, day_window=ROUND_TRIP_DAY_WINDOW, tolerance_pct=ROUND_TRIP_TOLERANCE_PCT):
+    table = transactions if isinstance(transactions, TransactionTable) else TransactionTable.from_transactions(transactions)
+    days, types = table.days, table.types
+    entries = [(table.amount_paise(i), days[i], types[i], i) for i in range(len(table)) if days[i] != UNKNOWN_DAY]
+    out = []
+    for debit, credit, gap in sweep_round_trips(entries, day_window, tolerance_pct):
+        out.append({
+            "kind": round_trip_kind(debit[1], credit[1]),
+            "debit": table[debit[3]],
+            "credit": table[credit[3]],
+            "days_apart": abs(credit[1] - debit[1]),
+            "amount_gap": Money(round(gap)),
+        })
+    out.sort(key=lambda p: (min(p["debit"].index, p["credit"].index)))
+    return out
+
+
+def analyze_risk(transactions, rules=None, keep_scores=True):
+    engine = RiskEngine(rules, keep_scores)
+    if isinstance(transactions, TransactionTable):
+        return engine.add_table(transactions).result()
+    consume_transactions(transactions, engine)
+    return engine.result()
+
+
+def detect_suspicious(transactions):
+    return analyze_risk(transactions, keep_scores=False)[0]
+
+
+# Lamba alternative pehle aur uske baad letter nahi: "Invoice 0042" me "inv" + "oice" na bane
+_INVOICE_REF_REGEX = re.compile(r"\b(?:invoice|inv|bill)(?![a-z])[\s\-#:]*([a-z0-9\-_/]{3,})\b")
+
+
+def extract_invoice_refs(text):
+    # Bina digit wala "ref" (jaise "no", "for") asli invoice number nahi hota
+    refs = _INVOICE_REF_REGEX.findall((text or "").lower())
+    return sorted({ref for ref in refs if any(ch.isdigit() for ch in ref)})
+
+
+_REF_KEY_JUNK = re.compile(r"[^a-z0-9]+")
+_REF_KEY_PREFIX = re.compile(r"^(?:invoice|inv|bill)(?=\d)")
+
+
+def invoice_ref_key(ref):
+    # "INV-0042", "inv 0042", "Invoice#0042" sab "0042" ban jate hain
+    return _REF_KEY_PREFIX.sub("", _REF_KEY_JUNK.sub("", str(ref or "").lower()))
+
+
+_PARTY_SPLIT_REGEX = re.compile(r"[|,/;-]")
+_SPACES_REGEX = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=65536)
+def party_from_description(text):
+    # Statements me wahi narration baar-baar aata hai; naam intern taaki har row ek hi string share kare
+    txt = (text or "").strip()
+    if not txt:
+        return "Unknown"
+    party = _SPACES_REGEX.sub(" ", _PARTY_SPLIT_REGEX.split(txt, 1)[0].strip())
+    return sys.intern(party[:60]) if party else "Unknown"
+
+
+@lru_cache(maxsize=65536)
+def party_key(name):
+    # "RAMESH TRADERS" aur "Ramesh Traders" ek hi party
+    return sys.intern(name.casefold())
+
+
+class PartyLedger:
+    # Balances paise me, party key par. Window badle to sirf kinaaron wali rows, table me
+    # rows append hon to sirf nayi rows - poora ledger dobara nahi banta
+    def __init__(self):
+        self.balances = {}
+        self.names = {}
+        self._table = None
+        self._table_size = 0
+        # (from_date, to_date, with_unknown) jo abhi ledger me laga hai; None = kuch nahi laga
+        self._window = None
+
+    def _apply(self, party, debit, credit, sign):
+        key = party_key(party)
+        b = self.balances.get(key)
+        if b is None:
+            b = self.balances[key] = [0, 0, 0]
+            self.names[key] = party
+        b[0] += sign * debit
+        b[1] += sign * credit
+        b[2] += sign
+        if b[2] <= 0:
+            del self.balances[key]
+            del self.names[key]
+
+    def add(self, tx):
+        self._apply(party_from_description(tx.get("description")), to_paise(tx.get("debit", 0.0)), to_paise(tx.get("credit", 0.0)), 1)
+
+    def add_rows(self, table, indexes, sign=1):
+        parties, debit, credit = table.party_names(), table.debit, table.credit
+        for i in indexes:
+            self._apply(parties[i], debit[i], credit[i], sign)
+
+    def clear(self):
+        self.balances.clear()
+        self.names.clear()
+        self._table = None
+        self._table_size = 0
+        self._window = None
+
+    def _add_appended(self, table):
+        # Table append-only hai: purani window me aane wali nayi rows hi jodni hain
+        start, self._table_size = self._table_size, len(table)
+        if self._window is None:
+            return
+        from_date, to_date, with_unknown = self._window
+        lo = from_date.toordinal() if from_date else None
+        hi = to_date.toordinal() if to_date else None
+        days = table.days
+        self.add_rows(table, [
+            i for i in range(start, len(table))
+            if (with_unknown if days[i] == UNKNOWN_DAY else (lo is None or days[i] >= lo) and (hi is None or days[i] <= hi))
+        ])
+
+    def set_window(self, table, from_date=None, to_date=None):
+        # Date window badle to sirf kinaaron wali rows add/remove (date index ke sorted order me)
+        if table is not self._table:
+            self.clear()
+            self._table = table
+            self._table_size = len(table)
+        elif len(table) != self._table_size:
+            self._add_appended(table)
+        index = table.date_index()
+        lo, hi = index.bounds(from_date, to_date)
+        with_unknown = not from_date and not to_date
+        if self._window is None:
+            old_lo, old_hi, old_unknown = 0, 0, False
+        else:
+            old_from, old_to, old_unknown = self._window
+            old_lo, old_hi = index.bounds(old_from, old_to)
+        order = index.order
+        for start, stop in ((old_lo, min(old_hi, lo)), (max(old_lo, hi), old_hi)):
+            if start < stop:
+                self.add_rows(table, order[start:stop], -1)
+        for start, stop in ((lo, min(hi, old_lo)), (max(lo, old_hi), hi)):
+            if start < stop:
+                self.add_rows(table, order[start:stop], 1)
+        if with_unknown != old_unknown:
+            self.add_rows(table, index.unknown, 1 if with_unknown else -1)
+        self._window = (from_date, to_date, with_unknown)
+        return self
+
+    def entry(self, key):
+        d, c, n = self.balances[key]
+        return {
+            "key": key,
+            "party": self.names[key],
+            "debit": d / 100.0,
+            "credit": c / 100.0,
+            "count": n,
+            "outstanding": (c - d) / 100.0,
+        }
+
+    def top(self, n):
+        # Sirf top-N outstanding ke liye heap; poora ledger sort nahi hota
+        keys = heapq.nlargest(n, self.balances, key=lambda k: abs(self.balances[k][1] - self.balances[k][0]))
+        return [self.entry(k) for k in keys]
+
+    def __len__(self):
+        return len(self.balances)
+
+    def result(self):
+        return self.top(len(self.balances))
+
+
+def build_party_ledger(transactions):
+    ledger = PartyLedger()
+    if isinstance(transactions, TransactionTable):
+        ledger.add_rows(transactions, range(len(transactions)))
+        return ledger.result()
+    consume_transactions(transactions, ledger)
+    return ledger.result()
+
+
+def suggest_gst_rate_from_categories(category_summary):
+    if isinstance(category_summary, AggregateCube):
+        category_summary = category_summary.category_totals()
+    total = sum(float(v) for v in category_summary.values()) or 1.0
+    weighted = 0.0
+    for cat, amt in category_summary.items():
+        weighted += float(amt) * CATEGORY_GST_SUGGEST.get(cat, 18.0)
+    return round(weighted / total, 2)
+
+
+def build_gstr_summary(total_debit, total_credit, gst_rate, interstate):
+    taxable = max(Money.of(total_credit) - Money.of(total_debit), Money(0))
+    gst = taxable.percent(gst_rate)
+    cgst, sgst, igst = gst_split(gst, interstate)
+    return {
+        "gstr1_estimated_taxable_outward": taxable,
+        "gstr3b_3_1_a_taxable": taxable,
+        "gstr3b_3_1_a_igst": igst,
+        "gstr3b_3_1_a_cgst": cgst,
+        "gstr3b_3_1_a_sgst": sgst,
+        "net_itc_assumed": Money(0),
+        "net_payable_estimated": gst,
+    }
+
+
+def score_anomalies(transactions):
+    return analyze_risk(transactions)[1]
+
+
+def parse_invoice_csv(file_path):
+    invoices = []
+    total = 0.0
+    with open_statement_text(file_path) as f:
+        reader = csv.DictReader(f)
+        amount_col = guess_column(reader.fieldnames or [], ["amount", "total", "value", "net"])
+        no_col = guess_column(reader.fieldnames or [], ["invoice no", "invoice", "bill no", "inv"])
+        date_col = guess_column(reader.fieldnames or [], ["date", "invoice date"])
+        party_col = guess_column(reader.fieldnames or [], ["party", "customer", "vendor", "name"])
+        if not amount_col:
+            raise ValueError("Invoice CSV me amount column required hai.")
+        dates = DateParser()
+        for row in reader:
+            amt = clean_amount(row.get(amount_col, ""))
+            if amt <= 0:
+                continue
+            total += amt
+            invoices.append(
+                {
+                    "invoice_no": str(row.get(no_col, "")).strip() if no_col else "",
+                    "date": dates.normalize(row.get(date_col, "")) if date_col else None,
+                    "party": str(row.get(party_col, "")).strip() if party_col else "",
+                    "amount": amt,
+                }
+            )
+    return invoices, total
+
+
+class InvoiceMatcher:
+    # Transactions par teen index: ref token -> rows, amount (sorted) aur har amount ke andar day (sorted).
+    # Har invoice sirf apne candidates dekhta hai; phir confidence ke hisaab se one-to-one assignment
+    def __init__(self, transactions, amount_tolerance_pct=INVOICE_AMOUNT_TOLERANCE_PCT,
+                 date_window=INVOICE_DATE_WINDOW_DAYS, min_confidence=INVOICE_MIN_CONFIDENCE):
+        if not isinstance(transactions, TransactionTable):
+            transactions = TransactionTable.from_transactions(transactions)
+        self.table = transactions
+        self.amount_tolerance_pct = amount_tolerance_pct
+        self.date_window = date_window
+        self.min_confidence = min_confidence
+
+        t = transactions
+        self.ref_index = defaultdict(list)
+        by_amount = defaultdict(list)
+        for i in range(len(t)):
+            for ref in extract_invoice_refs(t.descriptions[i]):
+                key = invoice_ref_key(ref)
+                if key:
+                    self.ref_index[key].append(i)
+            by_amount[t.amount_paise(i)].append((t.days[i], i))
+        self.amounts = array("q", sorted(by_amount))
+        self.days_by_amount = {}
+        for paise, rows in by_amount.items():
+            rows.sort()
+            self.days_by_amount[paise] = (array("i", (d for d, _i in rows)), [i for _d, i in rows])
+
+    def invoice_refs(self, inv):
+        keys = {invoice_ref_key(inv.get("invoice_no", ""))}
+        keys.update(invoice_ref_key(r) for r in extract_invoice_refs(inv.get("invoice_no", "")))
+        keys.discard("")
+        return keys
+
+    def candidates(self, inv):
+        paise = to_paise(inv.get("amount", 0.0))
+        day = day_ordinal(inv.get("date"))
+        found = set()
+        for key in self.invoice_refs(inv):
+            found.update(self.ref_index.get(key, ()))
+        ref_hits = set(found)
+
+        tolerance = int(paise * self.amount_tolerance_pct / 100.0)
+        lo = bisect_left(self.amounts, paise - tolerance)
+        hi = bisect_right(self.amounts, paise + tolerance)
+        # Pehle exact/nazdeek wale amount, taaki cap lage to bhi best wale na chhootein
+        for amount in sorted(self.amounts[lo:hi], key=lambda a: abs(a - paise)):
+            days, rows = self.days_by_amount[amount]
+            if day == UNKNOWN_DAY:
+                found.update(rows[:INVOICE_MAX_CANDIDATES])
+            else:
+                found.update(self._nearest_days(days, rows, day))
+            if len(found) - len(ref_hits) >= INVOICE_MAX_CANDIDATES:
+                break
+        return paise, day, tolerance, ref_hits, found
+
+    def _nearest_days(self, days, rows, day):
+        lo = bisect_left(days, day - self.date_window)
+        hi = bisect_right(days, day + self.date_window)
+        if hi - lo <= INVOICE_MAX_CANDIDATES:
+            return rows[lo:hi]
+        # Window me bahut rows hon to invoice date ke sabse paas wale
+        right = bisect_left(days, day, lo, hi)
+        left = right - 1
+        out = []
+        while len(out) < INVOICE_MAX_CANDIDATES:
+            if right < hi and (left < lo or days[right] - day <= day - days[left]):
+                out.append(rows[right])
+                right += 1
+            else:
+                out.append(rows[left])
+                left -= 1
+        return out
+
+    def score(self, paise, day, tolerance, ref_hit, i):
+        # Ref 50 + amount 35 + date 15 = 100
+        t = self.table
+        confidence = 50.0 if ref_hit else 0.0
+        gap = abs(t.amount_paise(i) - paise)
+        if gap <= tolerance:
+            confidence += 35 * (1 - gap / (tolerance + 1))
+        tx_day = t.days[i]
+        if day != UNKNOWN_DAY and tx_day != UNKNOWN_DAY:
+            days_apart = abs(tx_day - day)
+            if days_apart <= self.date_window:
+                confidence += 15 * (1 - days_apart / (self.date_window + 1))
+        return confidence
+
+    def reasons(self, paise, day, tolerance, ref_hit, i):
+        t = self.table
+        out = ["ref"] if ref_hit else []
+        gap = abs(t.amount_paise(i) - paise)
+        if gap <= tolerance:
+            out.append("amount" if gap == 0 else "amount~")
+        if day != UNKNOWN_DAY and t.days[i] != UNKNOWN_DAY and abs(t.days[i] - day) <= self.date_window:
+            out.append("date")
+        return out
+
+    def match(self, invoices):
+        edges = []
+        queries = []
+        for n, inv in enumerate(invoices):
+            query = self.candidates(inv)
+            queries.append(query)
+            paise, day, tolerance, ref_hits, found = query
+            t = self.table
+            for i in found:
+                # Sirf ref mila par amount tolerance se bahar: galat match ka khatra, edge hi nahi
+                if abs(t.amount_paise(i) - paise) > tolerance:
+                    continue
+                confidence = self.score(paise, day, tolerance, i in ref_hits, i)
+                if confidence >= self.min_confidence:
+                    edges.append((-confidence, n, i))
+        # Greedy one-to-one: sabse pakka match pehle; ek transaction sirf ek invoice ko
+        edges.sort()
+        assigned = {}
+        used = set()
+        for neg_confidence, n, i in edges:
+            if n in assigned or i in used:
+                continue
+            assigned[n] = (i, -neg_confidence)
+            used.add(i)
+
+        matches = []
+        unmatched = []
+        for n, inv in enumerate(invoices):
+            if n in assigned:
+                i, confidence = assigned[n]
+                paise, day, tolerance, ref_hits, _found = queries[n]
+                matches.append({
+                    "invoice": inv,
+                    "transaction": self.table[i],
+                    "confidence": round(confidence, 1),
+                    "matched_on": ", ".join(self.reasons(paise, day, tolerance, i in ref_hits, i)),
+                })
+            else:
+                unmatched.append(inv)
+        return matches, unmatched
+
+
+def match_invoices_with_transactions(invoices, transactions, **options):
+    return InvoiceMatcher(transactions, **options).match(invoices)
+
+
+REPORT_HEAD = """<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width,initial-scale=1">
+<title>{title}</title>
+<style>
+body{{font-family:Segoe UI,Arial,sans-serif;background:#f7f8fb;margin:0;padding:24px;color:#1e293b}}
+.card{{max-width:900px;margin:auto;background:#fff;border-radius:14px;padding:24px;box-shadow:0 10px 30px rgba(0,0,0,.08)}}
+h1{{margin:0 0 10px;font-size:24px}}
+h2{{margin-top:18px;font-size:20px}}
+small{{color:#64748b}}
+table{{width:100%;border-collapse:collapse;margin-top:16px}}
+th,td{{text-align:left;padding:10px;border-bottom:1px solid #e2e8f0}}
+th{{background:#f1f5f9}}
+.badge{{display:inline-block;padding:4px 10px;background:#ecfeff;color:#155e75;border-radius:999px;font-size:12px}}
+details.page{{margin-top:10px;content-visibility:auto}}
+details.page summary{{cursor:pointer;color:#155e75}}
+.note{{margin-top:16px;color:#64748b;font-size:13px}}
+</style>
+</head>
+<body>
+<div class="card">
+  <h1>{title}</h1>
+  <small>Generated: {generated}</small>
+  <div style="margin-top:8px"><span class="badge">Tax Basis: {basis}</span></div>
+"""
+REPORT_FOOT = """  <p class="note">
+    Note: Ye estimate report hai. Final GST filing se pehle CA se verify karna recommended hai.
+  </p>
+</div>
+</body>
+</html>
+"""
+REPORT_TRUNCATED = """  <p class="note"><b>Report size limit ({limit}) tak pahunch gaya - baaki rows chhod di gayi.</b></p>
+"""
+
+
+def _html_cell(value):
+    return html.escape(str(value), quote=False)
+
+
+class HtmlReportWriter:
+    # Report seedha disk par stream hoti hai: rows chhote chunks me likhte hain, poora HTML memory me nahi.
+    # max_bytes paar hone wala ho to aage ki rows chhod kar truncation note + footer likha jaata hai.
+    def __init__(self, fh, max_bytes=REPORT_MAX_BYTES, flush_bytes=REPORT_FLUSH_BYTES):
+        self.fh = fh
+        self.max_bytes = max_bytes
+        self.flush_bytes = flush_bytes
+        # Footer aur truncation note ke liye jagah pehle se bacha ke rakho
+        self._reserve = len((REPORT_FOOT + REPORT_TRUNCATED).encode("utf-8")) + 64
+        self._chunks = []
+        self._buffered = 0
+        self.written = 0
+        self.truncated = False
+
+    def write(self, text):
+        if self.truncated:
+            return False
+        data = text.encode("utf-8")
+        if self.max_bytes and self.written + self._buffered + len(data) + self._reserve > self.max_bytes:
+            self.truncated = True
+            return False
+        self._append(data)
+        return True
+
+    def close_tag(self, text):
+        # Limit ke baad bhi khuli table/page band honi chahiye (jagah reserve me hai)
+        self._append(text.encode("utf-8"))
+
+    def _append(self, data):
+        self._chunks.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self.flush_bytes:
+            self.flush()
+
+    def flush(self):
+        if self._chunks:
+            self.fh.write(b"".join(self._chunks))
+            self.written += self._buffered
+            self._chunks = []
+            self._buffered = 0
+
+    def table(self, headers, rows):
+        if not self.write("  <table>\n    <tr>" + "".join(f"<th>{_html_cell(h)}</th>" for h in headers) + "</tr>\n"):
+            return 0
+        count = 0
+        for row in rows:
+            if not self.write("    <tr>" + "".join(f"<td>{_html_cell(v)}</td>" for v in row) + "</tr>\n"):
+                break
+            count += 1
+        self.close_tag("  </table>\n")
+        return count
+
+    def section(self, title, headers, rows, page_rows=REPORT_PAGE_ROWS, max_rows=None):
+        # Badi sections page-wise <details> me; pehla page khula, baaki browser tab render kare jab khulein
+        if not self.write(f"  <h2>{_html_cell(title)}</h2>\n"):
+            return 0
+        rows = iter(rows)
+        total = 0
+        while not self.truncated and (max_rows is None or total < max_rows):
+            limit = page_rows if max_rows is None else min(page_rows, max_rows - total)
+            page = [row for _, row in zip(range(limit), rows)]
+            if not page:
+                break
+            opened = " open" if total == 0 else ""
+            if not self.write(f'  <details class="page"{opened}><summary>Rows {total + 1} - {total + len(page)}</summary>\n'):
+                break
+            total += self.table(headers, page)
+            self.close_tag("  </details>\n")
+        if max_rows is not None and total >= max_rows and next(rows, None) is not None:
+            self.write(f'  <p class="note">Pehli {max_rows} rows hi dikhayi gayi hain.</p>\n')
+        return total
+
+    def close(self):
+        self.flush()
+        tail = REPORT_FOOT
+        if self.truncated:
+            tail = REPORT_TRUNCATED.format(limit=f"{self.max_bytes // 1024} KB") + tail
+        data = tail.encode("utf-8")
+        self.fh.write(data)
+        self.written += len(data)
+
+
+def _report_transaction_rows(transactions):
+    for tx in transactions:
+        yield (
+            tx.get("date") or "Unknown Date",
+            tx.get("description") or "",
+            tx.get("category") or "Other",
+            money(tx.get("debit", 0.0)),
+            money(tx.get("credit", 0.0)),
+        )
+
+
+def _report_party_rows(parties):
+    for item in parties:
+        yield (item["party"], item["count"], money(item["debit"]), money(item["credit"]), money(item["outstanding"]))
+
+
+def write_html_report(path, report, transactions=None, parties=None,
+                      page_rows=REPORT_PAGE_ROWS, max_rows=None, max_bytes=REPORT_MAX_BYTES):
+    # report: analysis ke precomputed numbers - {"title", "generated", "basis", "metrics": [(label, value)],
+    # "days": [(day, count, debit, credit, taxable, gst, additional, total)]}. Yahan dobara calculation nahi hoti.
+    # transactions/parties diye hon tabhi unke sections likhe jaate hain (lazily iterate, list nahi banti).
+    with open(path, "wb") as fh:
+        out = HtmlReportWriter(fh, max_bytes=max_bytes)
+        out.write(REPORT_HEAD.format(
+            title=_html_cell(report.get("title", "Dukandar GST Statement Report")),
+            generated=_html_cell(report.get("generated") or datetime.now().strftime("%d-%m-%Y %H:%M:%S")),
+            basis=_html_cell(report.get("basis", "")),
+        ))
+        out.table(("Metric", "Value"), report.get("metrics", ()))
+        days = report.get("days")
+        if days:
+            out.write("  <h2>Per-Day Summary</h2>\n")
+            out.table(
+                ("Date", "Txn Count", "Debit", "Credit", "Taxable", "GST", "Additional", "Total Payable"),
+                ((day, count, *(money(v) for v in amounts)) for day, count, *amounts in days),
+            )
+        if parties is not None:
+            out.section("Party Ledger", ("Party", "Txns", "Paid", "Received", "Outstanding"),
+                        _report_party_rows(parties), page_rows, max_rows)
+        if transactions is not None:
+            out.section("Transactions", ("Date", "Description", "Category", "Debit", "Credit"),
+                        _report_transaction_rows(transactions), page_rows, max_rows)
+        out.close()
+    return {"path": path, "bytes": out.written, "truncated": out.truncated}
+
+
+def cloud_sync(url, token, payload):
+    if not url:
+        return "Skipped"
+    from urllib.request import Request, urlopen
+    data = json.dumps(payload).encode("utf-8")
+    req = Request(url, data=data, method="POST")
+    req.add_header("Content-Type", "application/json")
+    if token:
+        req.add_header("Authorization", f"Bearer {token}")
+    with urlopen(req, timeout=8) as r:
+        return f"HTTP {r.status}"
+
+
+def is_android_runtime():
+    return sys.platform == "android" or "ANDROID_ARGUMENT" in os.environ
+
+
+def run_cli_mode():
+    print(f"\n{APP_TITLE} - CLI Mode (Android/Terminal)\n")
+    print("Note: Desktop GUI tkinter Android par supported nahi hai.")
+    print("Yahaan file path dekar analysis chala sakte ho.\n")
+    set_custom_category_rules(load_state().get("category_rules"))
+
+    while True:
+        path = input("Statement file path (.csv/.pdf) [or 'exit']: ").strip().strip('"')
+        if path.lower() in {"exit", "quit"}:
+            print("Bye.")
+            return
+        if not path or not Path(path).exists():
+            print("Invalid path. Dubara try karo.\n")
+            continue
+
+        gst_rate = clean_amount(input("GST % (default 18): ").strip() or "18")
+        add_pct = clean_amount(input("Additional % (default 0): ").strip() or "0")
+        add_fixed = clean_amount(input("Additional Fixed (default 0): ").strip() or "0")
+        basis_in = (input("Tax basis [Credit/Debit/Net Credit] (default Net Credit): ").strip() or "Net Credit")
+        basis = basis_in if basis_in in {"Credit", "Debit", "Net Credit"} else "Net Credit"
+        workers = None
+        if Path(path).suffix.lower() == ".pdf":
+            workers = input(f"PDF workers (default {resolve_pdf_workers()}): ").strip() or None
+
+        try:
+            ext = Path(path).suffix.lower()
+            if ext not in {".csv", ".pdf"}:
+                print("Sirf CSV/PDF supported hai.\n")
+                continue
+            reset_ocr_stats()
+            summary = StatementSummary()
+            consume_transactions(iter_transactions(path, workers), summary)
+            d, c, r, daily = summary.total_debit, summary.total_credit, summary.rows_count, summary.daily
+
+            taxable, gst, additional, total_payable = summary.tax(gst_rate, add_pct, add_fixed, basis)
+            print("\n----- RESULT -----")
+            print(f"Transactions Parsed: {r}")
+            print(f"Total Debit: {money(d)}")
+            print(f"Total Credit: {money(c)}")
+            print(f"Tax Basis: {basis}")
+            print(f"Taxable Amount: {money(taxable)}")
+            print(f"GST: {money(gst)}")
+            print(f"Additional: {money(additional)}")
+            print(f"Total Payable: {money(total_payable)}")
+            print(f"Net Balance: {money(c - d)}")
+            print("\nPer-Day Summary:")
+            ordered_dates = sorted(daily.keys(), key=lambda x: (x == "Unknown Date", x))
+            for day in ordered_dates:
+                day_d = daily[day]["debit"]
+                day_c = daily[day]["credit"]
+                day_taxable, day_gst, day_additional, day_total = calculate_tax(
+                    day_d, day_c, gst_rate, add_pct, add_fixed, basis
+                )
+                print(
+                    f"- {day}: count={daily[day]['count']}, debit={money(day_d)}, "
+                    f"credit={money(day_c)}, taxable={money(day_taxable)}, "
+                    f"gst={money(day_gst)}, add={money(day_additional)}, total={money(day_total)}"
+                )
+            ocr = ocr_cache_stats()
+            if ocr["pages"]:
+                print(f"OCR pages: {ocr['pages']} (cache hit {ocr['hits']}, miss {ocr['misses']}, {ocr['seconds']:.1f}s OCR)")
+            print("------------------\n")
+        except Exception as e:
+            print(f"Error: {e}\n")
@@ -0,0 +1,945 @@
+import os
+import tempfile
+import tkinter as tk
+import webbrowser
+from datetime import datetime
+from pathlib import Path
+from tkinter import ttk, filedialog, messagebox
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from dukandar_core import (
+    ADMIN_UNLOCK_CODE, APP_TITLE, APP_VERSION, DOWNLOAD_LINK, FREE_TRIES, LOG_FILE, PAYEE_NAME,
+    PAYMENT_LINK, PAY_AMOUNT, QR_IMAGE_PATH, UPI_ID, UPI_NOTE, VERSION_URL,
+    AnalysisJob, PartyLedger, StatementDocument, calculate_tax, clean_amount, detect_duplicates, find_duplicate_clusters,
+    detect_file_source, detect_suspicious, filter_transactions, gst_split, load_state,
+    load_transaction_table, log_error, money, ocr_cache_stats, parse_date_input, parse_sales_csv,
+    reset_ocr_stats, save_state, set_custom_category_rules, write_html_report,
+)
+
+# ==============================================================================
+# Desktop GUI (Tkinter) - alag module taaki Kivy/Android/CLI tkinter load hi na karein
+# ==============================================================================
+ANALYSIS_POLL_MS = 50  # Worker thread ke events itne ms me UI par aate hain
+TREE_PAGE_ROWS = 200  # Treeview me ek page (scroll par agla page)
+SEARCH_DELAY_MS = 250  # Search box me typing rukne ke baad filter
+ANALYSIS_STAGES = {
+    "load": "Reading file",
+    "cache": "Cached table loaded",
+    "pages": "PDF pages",
+    "rows": "Rows parsed",
+    "summary": "Summarising",
+    "checks": "Duplicate/suspicious checks",
+    "party": "Party ledger",
+    "sales": "Sales CSV",
+}
+
+
+def _cell_sort_key(value):
+    # "₹ 1,234.50" / "12" number ki tarah sort, baaki text (tuple shape same taaki compare ho sake)
+    text = str(value)
+    number = text.replace("₹", "").replace(",", "").strip()
+    if number[:1] in ("-", ".") or number[:1].isdigit():
+        try:
+            return (0, float(number), "")
+        except ValueError:
+            pass
+    return (1, 0.0, text.casefold())
+
+
+class VirtualTree:
+    # Poora model Python list me; Treeview me sirf pehle `shown` rows (TREE_PAGE_ROWS ke page).
+    # Neeche scroll karne par agla page, heading click par sort, search() se filter.
+    # Sort/search keys pehli zaroorat par ek baar bante hain, har render par nahi.
+    def __init__(self, tree, scrollbar, render=None, sort_key=None, search_text=None, row_id=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.render = render or (lambda item: (item, ()))
+        self.sort_key = sort_key or (lambda item, col: _cell_sort_key(item[col]))
+        self.search_text = search_text or (lambda item: "\x1f".join(map(str, self.render(item)[0])).casefold())
+        self.row_id = row_id or (lambda item, i: str(i))
+        self.items = []
+        self.view = []
+        self.shown = 0
+        self.sort_col = None
+        self.sort_reverse = False
+        self.query = ""
+        self._keys = {}
+        self._text = None
+        self._rendered = {}
+        self._order = []
+        self._loading = False
+        self.columns = list(tree["columns"])
+        self._titles = {col: tree.heading(col, "text") for col in self.columns}
+        for pos, col in enumerate(self.columns):
+            tree.heading(col, command=lambda pos=pos: self.sort_by(pos))
+        tree.configure(yscrollcommand=self._on_yview)
+        scrollbar.configure(command=tree.yview)
+
+    def set_rows(self, items):
+        self.items = items
+        self._keys = {}
+        self._text = None
+        self._refresh()
+
+    def sort_by(self, col):
+        # Same column par click: ascending -> descending -> original order
+        if self.sort_col != col:
+            self.sort_col, self.sort_reverse = col, False
+        elif not self.sort_reverse:
+            self.sort_reverse = True
+        else:
+            self.sort_col, self.sort_reverse = None, False
+        for pos, name in enumerate(self.columns):
+            arrow = (" ▼" if self.sort_reverse else " ▲") if pos == self.sort_col else ""
+            self.tree.heading(name, text=self._titles[name] + arrow)
+        self._refresh()
+
+    def search(self, query):
+        query = query.strip().casefold()
+        if query != self.query:
+            self.query = query
+            self._refresh()
+
+    def _refresh(self):
+        order = range(len(self.items))
+        if self.sort_col is not None:
+            keys = self._keys.get(self.sort_col)
+            if keys is None:
+                keys = self._keys[self.sort_col] = [self.sort_key(item, self.sort_col) for item in self.items]
+            order = sorted(order, key=keys.__getitem__, reverse=self.sort_reverse)
+        if self.query:
+            if self._text is None:
+                self._text = [self.search_text(item) for item in self.items]
+            text, query = self._text, self.query
+            order = [i for i in order if query in text[i]]
+        self.view = list(order)
+        self.shown = min(len(self.view), TREE_PAGE_ROWS)
+        self._render()
+        self.tree.yview_moveto(0)
+
+    def _render(self):
+        # Pichhle render se diff: same iid + same values wali rows par koi Tk call nahi
+        tree, items, old = self.tree, self.items, self._rendered
+        rendered, wanted = {}, []
+        for i in self.view[:self.shown]:
+            item = items[i]
+            iid = self.row_id(item, i)
+            rendered[iid] = self.render(item)
+            wanted.append(iid)
+        stale = [iid for iid in self._order if iid not in rendered]
+        if stale:
+            tree.delete(*stale)
+        current = [iid for iid in self._order if iid in rendered]
+        for iid in wanted:
+            row = rendered[iid]
+            prev = old.get(iid)
+            if prev is None:
+                tree.insert("", "end", iid=iid, values=row[0], tags=row[1])
+                current.append(iid)
+            elif prev != row:
+                tree.item(iid, values=row[0], tags=row[1])
+        if current != wanted:
+            for pos, iid in enumerate(wanted):
+                tree.move(iid, "", pos)
+        self._rendered = rendered
+        self._order = wanted
+
+    def _on_yview(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) >= 0.999 and self.shown < len(self.view) and not self._loading:
+            self._loading = True
+            self.tree.after_idle(self._load_more)
+
+    def _load_more(self):
+        self._loading = False
+        self.shown = min(len(self.view), self.shown + TREE_PAGE_ROWS)
+        self._render()
+
+
+def _party_row(item):
+    outstanding = item["outstanding"]
+    tags = ("positive_balance",) if outstanding > 0 else ("negative_balance",) if outstanding < 0 else ()
+    return (item["party"], money(item["debit"]), money(item["credit"]), money(outstanding)), tags
+
+
+def _party_sort_key(item, col):
+    if col == 0:
+        return item["party"].casefold()
+    return item[("debit", "credit", "outstanding")[col - 1]]
+
+
+
+class App(tk.Tk):
+    def __init__(self):
+        super().__init__()
+        self.title(APP_TITLE)
+        self.geometry("950x620")
+        self.minsize(900, 560)
+
+        self.file_path = None
+        self.total_debit = 0.0
+        self.total_credit = 0.0
+        self.rows_count = 0
+        self.daily_summary = {}
+        self.monthly_summary = {}
+        self.category_summary = {}
+        self.transactions = []
+        self.transactions_key = None
+        self.filtered_transactions = []
+        self.duplicates = []
+        self.duplicate_clusters = []
+        self.alerts = []
+        self.detected_bank = "Unknown"
+        self.detected_format = "Generic"
+        self.detected_confidence = "low"
+        self.sales_total = 0.0
+        self.sales_monthly = {}
+        self.reco_gap = 0.0
+        self.party_ledger = []
+        self.party_book = PartyLedger()
+        self.job = None
+        self.analysis_params = None
+        self.staged_params = None
+        self.staged_results = {}
+        self.analysis_tax = None
+        self.day_breakdown = []
+        self._search_jobs = {}
+        self.state = load_state()
+        set_custom_category_rules(self.state.get("category_rules"))
+        self.used_tries = max(0, int(self.state.get("used_tries", 0)))
+        self.paid_unlocked = bool(self.state.get("paid_unlocked", False))
+        self.qr_img = None
+
+        self.gst_rate = tk.StringVar(value="18")
+        self.add_pct = tk.StringVar(value="0")
+        self.add_fixed = tk.StringVar(value="0")
+        self.tax_basis = tk.StringVar(value="Net Credit")
+        self.from_date = tk.StringVar(value="")
+        self.to_date = tk.StringVar(value="")
+        self.sales_file = tk.StringVar(value="")
+        self.language = tk.StringVar(value=self.state.get("language", "EN"))
+        self.interstate = tk.BooleanVar(value=bool(self.state.get("interstate", False)))
+        self.profile_name = tk.StringVar(value=self.state.get("current_profile", "Default"))
+        self.pdf_workers = tk.StringVar(value=str(self.state.get("pdf_workers", "auto")))
+        self.report_transactions = tk.BooleanVar(value=bool(self.state.get("report_transactions", False)))
+        self.report_parties = tk.BooleanVar(value=bool(self.state.get("report_parties", True)))
+
+        self._load_profile_values()
+
+        self._build_ui()
+        self._refresh_access_state()
+        if self._is_locked():
+            self.after(150, self.show_payment_popup)
+
+    def _load_profile_values(self):
+        profiles = self.state.get("profiles", {})
+        current = self.profile_name.get()
+        p = profiles.get(current, profiles.get("Default", {}))
+        if not p:
+            return
+        self.gst_rate.set(str(p.get("gst_rate", "18")))
+        self.add_pct.set(str(p.get("add_pct", "0")))
+        self.add_fixed.set(str(p.get("add_fixed", "0")))
+        self.tax_basis.set(str(p.get("tax_basis", "Net Credit")))
+        self.interstate.set(bool(p.get("interstate", False)))
+
+    def save_current_profile(self):
+        name = self.profile_name.get().strip() or "Default"
+        profiles = self.state.setdefault("profiles", {})
+        profiles[name] = {
+            "gst_rate": self.gst_rate.get().strip() or "18",
+            "add_pct": self.add_pct.get().strip() or "0",
+            "add_fixed": self.add_fixed.get().strip() or "0",
+            "tax_basis": self.tax_basis.get(),
+            "interstate": bool(self.interstate.get()),
+        }
+        self.state["current_profile"] = name
+        self.profile_name.set(name)
+        self.profile_combo.config(values=sorted(profiles.keys()))
+        self._persist_state()
+        messagebox.showinfo("Saved", f"Profile saved: {name}")
+
+    def apply_profile(self, _event=None):
+        self._load_profile_values()
+        self.state["current_profile"] = self.profile_name.get()
+        self._persist_state()
+
+    def change_language(self, _event=None):
+        self.state["language"] = self.language.get().strip().upper() or "EN"
+        self._persist_state()
+        self.status.set("Language updated. Labels remain mostly English/Hinglish.")
+
+    def open_log_file(self):
+        if LOG_FILE.exists():
+            webbrowser.open(str(LOG_FILE))
+        else:
+            messagebox.showinfo("Logs", "Abhi tak error logs nahi bane.")
+
+    def check_updates(self):
+        try:
+            with urlopen(VERSION_URL, timeout=5) as r:
+                latest = r.read().decode("utf-8", errors="ignore").strip()
+            if not latest:
+                raise ValueError("Invalid version response")
+            if latest != APP_VERSION:
+                if messagebox.askyesno("Update Available", f"Current: {APP_VERSION}\nLatest: {latest}\nDownload now?"):
+                    webbrowser.open(DOWNLOAD_LINK)
+            else:
+                messagebox.showinfo("Up to date", f"Current version {APP_VERSION} latest hai.")
+        except Exception as e:
+            log_error(e)
+            messagebox.showerror("Update Check Failed", str(e))
+
+    def _build_ui(self):
+        top = ttk.Frame(self, padding=12)
+        top.pack(fill="x")
+
+        ttk.Label(top, text="Statement File (CSV/PDF):").grid(row=0, column=0, sticky="w")
+        self.file_entry = ttk.Entry(top, width=78)
+        self.file_entry.grid(row=0, column=1, padx=8, sticky="we")
+        ttk.Button(top, text="Browse", command=self.browse_file).grid(row=0, column=2, padx=4)
+
+        ttk.Label(top, text="Profile").grid(row=1, column=0, sticky="w", pady=(8, 0))
+        profiles = sorted(self.state.get("profiles", {}).keys())
+        self.profile_combo = ttk.Combobox(top, textvariable=self.profile_name, values=profiles, state="readonly", width=30)
+        self.profile_combo.grid(row=1, column=1, sticky="w", pady=(8, 0))
+        self.profile_combo.bind("<<ComboboxSelected>>", self.apply_profile)
+        ttk.Button(top, text="Save Profile", command=self.save_current_profile).grid(row=1, column=2, padx=4, pady=(8, 0))
+
+        ttk.Label(top, text="Sales CSV (Reconciliation)").grid(row=2, column=0, sticky="w", pady=(8, 0))
+        ttk.Entry(top, textvariable=self.sales_file, width=78).grid(row=2, column=1, padx=8, sticky="we", pady=(8, 0))
+        ttk.Button(top, text="Browse Sales", command=self.browse_sales_file).grid(row=2, column=2, padx=4, pady=(8, 0))
+
+        settings = ttk.LabelFrame(self, text="Tax Settings", padding=12)
+        settings.pack(fill="x", padx=12, pady=6)
+
+        ttk.Label(settings, text="GST %").grid(row=0, column=0, sticky="w")
+        ttk.Entry(settings, textvariable=self.gst_rate, width=12).grid(row=0, column=1, padx=8)
+
+        ttk.Label(settings, text="Additional %").grid(row=0, column=2, sticky="w")
+        ttk.Entry(settings, textvariable=self.add_pct, width=12).grid(row=0, column=3, padx=8)
+
+        ttk.Label(settings, text="Additional Fixed (₹)").grid(row=0, column=4, sticky="w")
+        ttk.Entry(settings, textvariable=self.add_fixed, width=12).grid(row=0, column=5, padx=8)
+
+        ttk.Label(settings, text="Tax Basis").grid(row=0, column=6, sticky="w")
+        ttk.Combobox(
+            settings,
+            textvariable=self.tax_basis,
+            values=["Credit", "Debit", "Net Credit"],
+            state="readonly",
+            width=14
+        ).grid(row=0, column=7, padx=8)
+
+        ttk.Label(settings, text="From Date (YYYY-MM-DD)").grid(row=1, column=0, sticky="w", pady=(8, 0))
+        ttk.Entry(settings, textvariable=self.from_date, width=18).grid(row=1, column=1, padx=8, pady=(8, 0))
+        ttk.Label(settings, text="To Date (YYYY-MM-DD)").grid(row=1, column=2, sticky="w", pady=(8, 0))
+        ttk.Entry(settings, textvariable=self.to_date, width=18).grid(row=1, column=3, padx=8, pady=(8, 0))
+        ttk.Checkbutton(settings, text="Interstate (IGST)", variable=self.interstate).grid(row=1, column=4, columnspan=2, sticky="w", pady=(8, 0))
+        ttk.Label(settings, text="Language").grid(row=1, column=6, sticky="w", pady=(8, 0))
+        lang_box = ttk.Combobox(settings, textvariable=self.language, values=["EN", "HI"], state="readonly", width=14)
+        lang_box.grid(row=1, column=7, padx=8, pady=(8, 0))
+        lang_box.bind("<<ComboboxSelected>>", self.change_language)
+        ttk.Label(settings, text="PDF Workers (auto/1-N)").grid(row=2, column=0, sticky="w", pady=(8, 0))
+        ttk.Entry(settings, textvariable=self.pdf_workers, width=18).grid(row=2, column=1, padx=8, pady=(8, 0))
+        ttk.Checkbutton(settings, text="Report: Party Ledger", variable=self.report_parties).grid(row=2, column=2, columnspan=2, sticky="w", pady=(8, 0))
+        ttk.Checkbutton(settings, text="Report: All Transactions", variable=self.report_transactions).grid(row=2, column=4, columnspan=2, sticky="w", pady=(8, 0))
+
+        btns = ttk.Frame(self, padding=(12, 2))
+        btns.pack(fill="x")
+        self.analyze_btn = ttk.Button(btns, text="Analyze", command=self.analyze)
+        self.analyze_btn.pack(side="left", padx=4)
+        self.report_btn = ttk.Button(btns, text="Generate HTML Report", command=self.generate_html_report)
+        self.report_btn.pack(side="left", padx=4)
+        self.cancel_btn = ttk.Button(btns, text="Cancel", command=self.cancel_analysis, state="disabled")
+        self.cancel_btn.pack(side="left", padx=4)
+        ttk.Button(btns, text="Check Updates", command=self.check_updates).pack(side="left", padx=4)
+        ttk.Button(btns, text="Open Logs", command=self.open_log_file).pack(side="left", padx=4)
+        self.unlock_btn = ttk.Button(btns, text="Unlock (Pay ₹10)", command=self.show_payment_popup)
+        self.unlock_btn.pack(side="left", padx=4)
+        ttk.Button(btns, text="Open Payment Link (₹10 / month)", command=lambda: webbrowser.open(PAYMENT_LINK)).pack(side="right", padx=4)
+        ttk.Button(btns, text="Open Download Link", command=lambda: webbrowser.open(DOWNLOAD_LINK)).pack(side="right", padx=4)
+
+        notebook = ttk.Notebook(self)
+        notebook.pack(fill="both", expand=True, padx=12, pady=8)
+
+        summary_frame = ttk.Frame(notebook)
+        notebook.add(summary_frame, text="Summary & Breakdown")
+
+        summary_search = self._search_box(summary_frame)
+        summary_body = ttk.Frame(summary_frame)
+        summary_body.pack(fill="both", expand=True)
+        summary_scroll = ttk.Scrollbar(summary_body, orient="vertical")
+        summary_scroll.pack(side="right", fill="y")
+        self.tree = ttk.Treeview(summary_body, columns=("date", "metric", "value"), show="headings", height=18)
+        self.tree.heading("date", text="Date")
+        self.tree.heading("metric", text="Metric")
+        self.tree.heading("value", text="Value")
+        self.tree.column("date", width=180, anchor="w")
+        self.tree.column("metric", width=280, anchor="w")
+        self.tree.column("value", width=390, anchor="w")
+        self.tree.pack(fill="both", expand=True)
+        self.summary_view = VirtualTree(self.tree, summary_scroll)
+        summary_search.trace_add("write", lambda *_: self._schedule_search(self.summary_view, summary_search))
+
+        party_frame = ttk.Frame(notebook)
+        notebook.add(party_frame, text="Party Ledger")
+
+        party_search = self._search_box(party_frame)
+        party_body = ttk.Frame(party_frame)
+        party_body.pack(fill="both", expand=True)
+        party_scroll = ttk.Scrollbar(party_body, orient="vertical")
+        party_scroll.pack(side="right", fill="y")
+        self.party_tree = ttk.Treeview(party_body, columns=("party", "debit", "credit", "outstanding"), show="headings")
+        self.party_tree.heading("party", text="Party/Customer")
+        self.party_tree.heading("debit", text="Total Paid (Debit)")
+        self.party_tree.heading("credit", text="Total Received (Credit)")
+        self.party_tree.heading("outstanding", text="Outstanding (Credit - Debit)")
+        self.party_tree.column("party", width=350, anchor="w")
+        self.party_tree.column("debit", width=150, anchor="e")
+        self.party_tree.column("credit", width=150, anchor="e")
+        self.party_tree.column("outstanding", width=200, anchor="e")
+        self.party_tree.pack(fill="both", expand=True)
+        self.party_tree.tag_configure('positive_balance', foreground='green')
+        self.party_tree.tag_configure('negative_balance', foreground='red')
+        self.party_view = VirtualTree(
+            self.party_tree, party_scroll,
+            render=_party_row,
+            sort_key=_party_sort_key,
+            search_text=lambda item: item["party"].casefold(),
+            row_id=lambda item, _i: f"p:{item['key']}",
+        )
+        party_search.trace_add("write", lambda *_: self._schedule_search(self.party_view, party_search))
+
+        self.status = tk.StringVar(value="Ready")
+        status_bar = ttk.Frame(self)
+        status_bar.pack(fill="x", padx=12, pady=(0, 10))
+        self.progress = ttk.Progressbar(status_bar, length=180)
+        self.progress.pack(side="right")
+        ttk.Label(status_bar, textvariable=self.status, anchor="w").pack(side="left", fill="x", expand=True)
+
+    def _search_box(self, parent):
+        bar = ttk.Frame(parent, padding=(0, 4))
+        bar.pack(fill="x")
+        ttk.Label(bar, text="Search").pack(side="left", padx=(0, 6))
+        query = tk.StringVar(value="")
+        ttk.Entry(bar, textvariable=query, width=40).pack(side="left")
+        return query
+
+    def _schedule_search(self, view, query):
+        # Har keystroke par filter nahi - typing rukne ke baad ek baar
+        pending = self._search_jobs.pop(id(view), None)
+        if pending is not None:
+            self.after_cancel(pending)
+        self._search_jobs[id(view)] = self.after(SEARCH_DELAY_MS, lambda: view.search(query.get()))
+
+    def _is_locked(self):
+        return (not self.paid_unlocked) and self.used_tries >= FREE_TRIES
+
+    def _tries_left(self):
+        return max(FREE_TRIES - self.used_tries, 0)
+
+    def _persist_state(self):
+        self.state["used_tries"] = self.used_tries
+        self.state["paid_unlocked"] = self.paid_unlocked
+        self.state["language"] = self.language.get().strip().upper() or "EN"
+        self.state["interstate"] = bool(self.interstate.get())
+        self.state["current_profile"] = self.profile_name.get().strip() or "Default"
+        self.state["pdf_workers"] = self.pdf_workers.get().strip() or "auto"
+        self.state["report_transactions"] = bool(self.report_transactions.get())
+        self.state["report_parties"] = bool(self.report_parties.get())
+        save_state(self.state)
+
+    def _refresh_access_state(self):
+        if self._is_locked():
+            self.analyze_btn.config(state="disabled")
+            self.report_btn.config(state="disabled")
+            self.status.set("Free tries khatam. Unlock ke liye payment karo.")
+        else:
+            self.analyze_btn.config(state="normal")
+            self.report_btn.config(state="normal")
+            if self.paid_unlocked:
+                self.status.set("Paid plan active. Unlimited usage.")
+            else:
+                self.status.set(f"Free tries left: {self._tries_left()} / {FREE_TRIES}")
+
+    def _consume_try(self):
+        if self.paid_unlocked:
+            return
+        self.used_tries += 1
+        self._persist_state()
+        self._refresh_access_state()
+        if self._is_locked():
+            messagebox.showinfo("Free Limit", "Aapke 10 free tries complete ho gaye. Ab payment required hai.")
+            self.show_payment_popup()
+
+    def _open_upi_intent(self):
+        params = {
+            "pa": UPI_ID,
+            "pn": PAYEE_NAME,
+            "am": f"{PAY_AMOUNT:.2f}",
+            "cu": "INR",
+            "tn": UPI_NOTE,
+        }
+        upi_link = "upi://pay?" + urlencode(params)
+        webbrowser.open(upi_link)
+
+    def show_payment_popup(self):
+        if self.paid_unlocked:
+            messagebox.showinfo("Info", "App already unlocked.")
+            return
+
+        popup = tk.Toplevel(self)
+        popup.title("Unlock Required")
+        popup.geometry("420x560")
+        popup.resizable(False, False)
+        popup.grab_set()
+        popup.transient(self)
+
+        ttk.Label(
+            popup,
+            text=f"Free tries used: {self.used_tries}/{FREE_TRIES}\nUnlock ke liye ₹{PAY_AMOUNT} payment karein.",
+            justify="center",
+        ).pack(pady=10)
+
+        qr_base = Path(__file__).with_name(QR_IMAGE_PATH)
+        qr_candidates = [qr_base]
+        # Common fallback names/extensions, so a minor filename mismatch doesn't break unlock UI.
+        for name in ("QR_code.jpg", "QR_code.jpeg", "QR_code.png"):
+            p = Path(__file__).with_name(name)
+            if p not in qr_candidates:
+                qr_candidates.append(p)
+        qr_path = next((p for p in qr_candidates if p.exists()), None)
+
+        if qr_path:
+            try:
+                self.qr_img = tk.PhotoImage(file=str(qr_path))
+                ttk.Label(popup, image=self.qr_img).pack(pady=6)
+            except Exception:
+                ttk.Label(popup, text="QR image load nahi hua. Neeche payment link use karein.").pack(pady=6)
+        else:
+            ttk.Label(popup, text=f"QR file nahi mili: {qr_base.name}").pack(pady=6)
+
+        ttk.Label(popup, text=f"UPI: {UPI_ID}").pack(pady=4)
+        ttk.Button(popup, text="Open UPI Payment", command=self._open_upi_intent).pack(pady=4)
+        ttk.Button(popup, text="Open Payment Link", command=lambda: webbrowser.open(PAYMENT_LINK)).pack(pady=4)
+
+        ttk.Separator(popup).pack(fill="x", padx=16, pady=10)
+        ttk.Label(popup, text="Payment ke baad unlock code daalein:").pack(pady=4)
+        code_var = tk.StringVar()
+        ttk.Entry(popup, textvariable=code_var, width=36).pack(pady=4)
+
+        def do_unlock():
+            if code_var.get().strip() == ADMIN_UNLOCK_CODE:
+                self.paid_unlocked = True
+                self._persist_state()
+                self._refresh_access_state()
+                popup.destroy()
+                messagebox.showinfo("Success", "App unlocked successfully.")
+            else:
+                messagebox.showerror("Invalid", "Unlock code galat hai.")
+
+        ttk.Button(popup, text="Unlock App", command=do_unlock).pack(pady=8)
+        ttk.Label(
+            popup,
+            text="Note: app offline hai, isliye payment auto-verify nahi hota.\nAap payment check karke code share karein.",
+            justify="center",
+        ).pack(pady=8)
+
+    def browse_file(self):
+        path = filedialog.askopenfilename(
+            title="Select Statement",
+            filetypes=[("Statements", "*.csv *.pdf"), ("CSV", "*.csv"), ("PDF", "*.pdf"), ("All files", "*.*")]
+        )
+        if path:
+            self.file_path = path
+            self.file_entry.delete(0, tk.END)
+            self.file_entry.insert(0, path)
+
+    def browse_sales_file(self):
+        path = filedialog.askopenfilename(
+            title="Select Sales CSV",
+            filetypes=[("CSV", "*.csv"), ("All files", "*.*")]
+        )
+        if path:
+            self.sales_file.set(path)
+
+    def analyze(self):
+        if self._is_locked():
+            self.show_payment_popup()
+            return
+        if self.job is not None and not self.job.finished:
+            return
+
+        path = self.file_entry.get().strip()
+        if not path or not Path(path).exists():
+            messagebox.showerror("Error", "Valid file select karo.")
+            return
+
+        try:
+            ext = Path(path).suffix.lower()
+            if ext not in (".csv", ".pdf"):
+                messagebox.showerror("Error", "Sirf CSV/PDF supported hai.")
+                return
+
+            from_date = parse_date_input(self.from_date.get())
+            to_date = parse_date_input(self.to_date.get())
+            if self.from_date.get().strip() and from_date is None:
+                messagebox.showerror("Error", "From Date invalid hai. Use YYYY-MM-DD.")
+                return
+            if self.to_date.get().strip() and to_date is None:
+                messagebox.showerror("Error", "To Date invalid hai. Use YYYY-MM-DD.")
+                return
+            if from_date and to_date and from_date > to_date:
+                messagebox.showerror("Error", "From Date, To Date se bada nahi ho sakta.")
+                return
+            sales_path = self.sales_file.get().strip()
+            if sales_path and not Path(sales_path).exists():
+                messagebox.showerror("Error", "Sales CSV path invalid hai.")
+                return
+
+            # Worker thread tk variables nahi padhta - saari inputs yahin snapshot
+            st = os.stat(path)
+            transactions_key = (os.path.abspath(path), st.st_mtime_ns, st.st_size, self.pdf_workers.get())
+            params = {
+                "path": path,
+                "key": transactions_key,
+                # Sirf From/To badla ho to wahi table (aur uska date index) dobara use karo
+                "table": self.transactions if transactions_key == self.transactions_key else None,
+                "workers": self.pdf_workers.get(),
+                "from_date": from_date,
+                "to_date": to_date,
+                "sales_path": sales_path,
+                "gst_rate": clean_amount(self.gst_rate.get()),
+                "add_pct": clean_amount(self.add_pct.get()),
+                "add_fixed": clean_amount(self.add_fixed.get()),
+                "basis": self.tax_basis.get(),
+                "interstate": bool(self.interstate.get()),
+            }
+        except Exception as e:
+            log_error(e)
+            messagebox.showerror("Error", str(e))
+            self.status.set("Failed.")
+            return
+
+        reset_ocr_stats()
+        # Batches yahan jama hote hain; "done" par hi self.* me aate hain (cancel/error par purane results bache rahein)
+        self.staged_params = params
+        self.staged_results = {}
+        self.job = AnalysisJob(self._analysis_work, params).start()
+        self.analyze_btn.config(state="disabled")
+        self.report_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self.progress.config(mode="indeterminate", value=0)
+        self.progress.start(15)
+        self.status.set(f"Analyzing {os.path.basename(path)} ...")
+        self.after(ANALYSIS_POLL_MS, self._poll_analysis)
+
+    def cancel_analysis(self):
+        if self.job is not None and not self.job.finished:
+            self.job.cancel()
+            self.cancel_btn.config(state="disabled")
+            self.status.set("Cancelling...")
+
+    def _analysis_work(self, job, p):
+        # Worker thread: sirf compute + job.emit(); widgets ko haath nahi lagata.
+        # Har stage ke beech job.check()/progress() par Cancel turant lagta hai.
+        txns = p["table"]
+        if txns is None:
+            job.progress("load", 0)
+            with StatementDocument(p["path"]) as doc:
+                txns = load_transaction_table(doc, workers=p["workers"], progress=job.progress)
+                source = detect_file_source(doc)
+            job.emit("table", (txns, p["key"], source))
+
+        from_date, to_date = p["from_date"], p["to_date"]
+        job.progress("summary", 0)
+        filtered = filter_transactions(txns, from_date, to_date)
+        # Totals/daily/monthly/category seedha prefix-sum cube se (rows dobara nahi ginte)
+        cube = txns.aggregate_cube()
+        summary = cube.summary(from_date, to_date)
+        job.emit("summary", (filtered, summary))
+
+        job.progress("checks", 0)
+        duplicates = detect_duplicates(filtered)
+        job.check()
+        clusters = find_duplicate_clusters(filtered)
+        job.check()
+        job.emit("checks", (duplicates, clusters, detect_suspicious(filtered)))
+
+        # Window badalne par sirf kinaare wali rows ka balance badalta hai
+        job.progress("party", 0)
+        self.party_book.set_window(txns, from_date, to_date)
+        job.emit("party", self.party_book.result())
+
+        if p["sales_path"]:
+            job.progress("sales", 0)
+            job.emit("sales", parse_sales_csv(p["sales_path"]))
+        job.emit("tax", cube.tax(p["gst_rate"], p["add_pct"], p["add_fixed"], p["basis"], from_date, to_date))
+
+        # Per-day tax ek hi baar yahin; summary tab aur HTML report dono isi ko use karte hain
+        daily = summary[2]
+        day_breakdown = []
+        for day in sorted(daily, key=lambda x: (x == "Unknown Date", x)):
+            d, c = daily[day]["debit"], daily[day]["credit"]
+            day_breakdown.append(
+                (day, daily[day]["count"], d, c, *calculate_tax(d, c, p["gst_rate"], p["add_pct"], p["add_fixed"], p["basis"]))
+            )
+        job.emit("days", day_breakdown)
+
+    def _apply_result(self, name, value):
+        if name == "table":
+            self.transactions, self.transactions_key, source = value
+            self.detected_bank, self.detected_format, self.detected_confidence = source
+        elif name == "summary":
+            self.filtered_transactions, summary = value
+            self.rows_count = len(self.filtered_transactions)
+            self.total_debit, self.total_credit, self.daily_summary, self.monthly_summary, self.category_summary = summary
+            self.sales_total = 0.0
+            self.sales_monthly = {}
+            self.reco_gap = 0.0
+        elif name == "checks":
+            self.duplicates, self.duplicate_clusters, self.alerts = value
+        elif name == "party":
+            self.party_ledger = value
+            self.party_view.set_rows(value)
+        elif name == "sales":
+            self.sales_total, self.sales_monthly = value
+            self.reco_gap = self.total_credit - self.sales_total
+        elif name == "tax":
+            self.analysis_tax = value
+        elif name == "days":
+            self.day_breakdown = value
+
+    def _commit_results(self):
+        # Poora run safal hua tabhi params + saare batches ek saath lagte hain (emit wale order me)
+        self.analysis_params = self.staged_params
+        staged, self.staged_results = self.staged_results, {}
+        for name, value in staged.items():
+            self._apply_result(name, value)
+
+    def _provisional_rows(self):
+        # Chalte run ke staged batches se sirf headline; App state ko haath nahi lagata
+        staged = self.staged_results
+        rows = [("-", "File", self.staged_params["path"]), ("-", "Status", "Analysis chal raha hai (partial)...")]
+        if "table" in staged:
+            _, _, (bank, fmt, confidence) = staged["table"]
+            rows.append(("-", "Detected Bank", bank))
+            rows.append(("-", "Detected Format", f"{fmt} ({confidence})"))
+        if "summary" in staged:
+            filtered, (total_debit, total_credit, *_) = staged["summary"]
+            rows.append(("-", "Transactions Parsed", str(len(filtered))))
+            rows.append(("-", "Total Debit / Transfer Out", money(total_debit)))
+            rows.append(("-", "Total Credit / Received", money(total_credit)))
+            rows.append(("-", "Net Balance (Credit - Debit)", money(total_credit - total_debit)))
+        if "checks" in staged:
+            duplicates, clusters, alerts = staged["checks"]
+            rows.append(("-", "Duplicates Found", str(len(duplicates))))
+            rows.append(("-", "Near-Duplicate Groups", str(len(clusters))))
+            rows.append(("-", "Suspicious Alerts", str(len(alerts))))
+        if "tax" in staged:
+            rows.append(("-", "Total Estimated Payable", money(staged["tax"][3])))
+        return rows
+
+    def _show_provisional(self, names):
+        if "party" in names:
+            self.party_view.set_rows(self.staged_results["party"])
+        if names & {"table", "summary", "checks", "tax"}:
+            self.summary_view.set_rows(self._provisional_rows())
+
+    def _discard_provisional(self):
+        # Cancel/error par adhoora view hatao aur pichle committed run ka view wapas
+        self.staged_results = {}
+        self.party_view.set_rows(self.party_ledger)
+        self.summary_view.set_rows(self._summary_rows() if self.analysis_tax is not None else [])
+
+    def _poll_analysis(self):
+        job = self.job
+        last_progress = None
+        arrived = set()
+        for kind, name, value in job.poll():
+            if kind == "progress":
+                # Ek tick me kai progress events aaye to sirf aakhri dikhao
+                last_progress = (name, value)
+            elif kind == "result":
+                self.staged_results[name] = value
+                arrived.add(name)
+            elif kind == "done":
+                self._commit_results()
+                self._finish_analysis()
+            elif kind == "cancelled":
+                self._discard_provisional()
+                self._stop_progress()
+                self.status.set("Analysis cancelled.")
+            elif kind == "error":
+                self._discard_provisional()
+                self._stop_progress()
+                messagebox.showerror("Error", str(value))
+                self.status.set("Failed.")
+        if job.finished:
+            return
+        if arrived:
+            # Batch aate hi dikhao (provisional); App state "done" par hi commit hoti hai
+            self._show_provisional(arrived)
+        if last_progress is not None:
+            self._show_progress(*last_progress)
+        self.after(ANALYSIS_POLL_MS, self._poll_analysis)
+
+    def _show_progress(self, stage, value):
+        done, total = value
+        if total:
+            if str(self.progress.cget("mode")) != "determinate":
+                self.progress.stop()
+                self.progress.config(mode="determinate", maximum=total)
+            self.progress.config(value=done)
+            self.status.set(f"{ANALYSIS_STAGES.get(stage, stage)}: {done} / {total}")
+        elif done:
+            self.status.set(f"{ANALYSIS_STAGES.get(stage, stage)}: {done}")
+        else:
+            if str(self.progress.cget("mode")) != "indeterminate":
+                self.progress.config(mode="indeterminate", value=0)
+                self.progress.start(15)
+            self.status.set(f"{ANALYSIS_STAGES.get(stage, stage)}...")
+
+    def _stop_progress(self):
+        self.progress.stop()
+        self.progress.config(mode="determinate", value=0)
+        self.cancel_btn.config(state="disabled")
+        self._refresh_access_state()
+
+    def _finish_analysis(self):
+        self._stop_progress()
+        self.summary_view.set_rows(self._summary_rows())
+
+        self._consume_try()
+        ocr = ocr_cache_stats()
+        if ocr["pages"]:
+            self.status.set(
+                f"Analysis complete. OCR pages: {ocr['pages']} (cache hit {ocr['hits']}, miss {ocr['misses']})"
+            )
+        else:
+            self.status.set("Analysis complete.")
+
+    def _headline_metrics(self):
+        p = self.analysis_params
+        taxable, gst, additional, total_payable = self.analysis_tax
+        cgst, sgst, igst = gst_split(gst, p["interstate"])
+        metrics = [
+            ("File", p["path"]),
+            ("Detected Bank", self.detected_bank),
+            ("Detected Format", f"{self.detected_format} ({self.detected_confidence})"),
+            ("Transactions Parsed", str(self.rows_count)),
+            ("Total Debit / Transfer Out", money(self.total_debit)),
+            ("Total Credit / Received", money(self.total_credit)),
+            ("Tax Basis", p["basis"]),
+            ("Taxable Amount", money(taxable)),
+            (f"GST ({p['gst_rate']:.2f}%)", money(gst)),
+            ("CGST", money(cgst)),
+            ("SGST", money(sgst)),
+            ("IGST", money(igst)),
+            (f"Additional Charges ({p['add_pct']:.2f}% + fixed)", money(additional)),
+            ("Total Estimated Payable", money(total_payable)),
+            ("Net Balance (Credit - Debit)", money(self.total_credit - self.total_debit)),
+            ("Duplicates Found", str(len(self.duplicates))),
+            ("Near-Duplicate Groups", str(len(self.duplicate_clusters))),
+            ("Suspicious Alerts", str(len(self.alerts))),
+        ]
+        if p["sales_path"]:
+            metrics.append(("Sales Total (CSV)", money(self.sales_total)))
+            metrics.append(("Reconciliation Gap (Credit - Sales)", money(self.reco_gap)))
+        return metrics
+
+    def _summary_rows(self):
+        sales_path = self.analysis_params["sales_path"]
+        rows = [("-", label, value) for label, value in self._headline_metrics()]
+        rows.extend(
+            [
+                ("-", "", ""),
+                ("-", "Per-Day Breakdown", ""),
+            ]
+        )
+
+        for day, count, day_d, day_c, day_taxable, day_gst, day_additional, day_total in self.day_breakdown:
+            rows.append((day, "Txn Count", str(count)))
+            rows.append((day, "Debit", money(day_d)))
+            rows.append((day, "Credit", money(day_c)))
+            rows.append((day, "Taxable", money(day_taxable)))
+            rows.append((day, "GST", money(day_gst)))
+            rows.append((day, "Additional", money(day_additional)))
+            rows.append((day, "Total Payable", money(day_total)))
+
+        rows.append(("-", "", ""))
+        rows.append(("-", "Monthly Summary", ""))
+        for mon in sorted(self.monthly_summary.keys()):
+            m = self.monthly_summary[mon]
+            rows.append((mon, "Txn Count", str(m["count"])))
+            rows.append((mon, "Debit", money(m["debit"])))
+            rows.append((mon, "Credit", money(m["credit"])))
+
+        rows.append(("-", "", ""))
+        rows.append(("-", "Category Summary", ""))
+        for cat, amt in sorted(self.category_summary.items(), key=lambda x: x[1], reverse=True):
+            rows.append(("-", cat, money(amt)))
+
+        if sales_path:
+            rows.append(("-", "", ""))
+            rows.append(("-", "Sales Reconciliation (Monthly)", ""))
+            for mon in sorted(set(self.monthly_summary.keys()) | set(self.sales_monthly.keys())):
+                credit_amt = self.monthly_summary.get(mon, {}).get("credit", 0.0)
+                sales_amt = self.sales_monthly.get(mon, 0.0)
+                gap = credit_amt - sales_amt
+                rows.append((mon, "Credit vs Sales", f"{money(credit_amt)} vs {money(sales_amt)} (Gap {money(gap)})"))
+
+        if self.alerts:
+            rows.append(("-", "", ""))
+            rows.append(("-", "Suspicious Alerts", ""))
+            for a in self.alerts[:12]:
+                rows.append(("-", "Alert", a))
+
+        if self.duplicate_clusters:
+            rows.append(("-", "", ""))
+            rows.append(("-", "Near-Duplicate Groups", ""))
+            for group in self.duplicate_clusters[:12]:
+                first = group["rows"][0]
+                rows.append((
+                    first["date"],
+                    f"{len(group['rows'])}x {money(group['amount'])} (match {group['similarity']:.0%}, {group['day_span']}d)",
+                    first["description"][:60],
+                ))
+        return rows
+
+    def generate_html_report(self):
+        if self._is_locked():
+            self.show_payment_popup()
+            return
+
+        if self.rows_count == 0 or self.analysis_tax is None:
+            messagebox.showwarning("Warning", "Pehle Analyze karo.")
+            return
+
+        # Saare numbers analysis model se (tab wale hi) - yahan calculate_tax dobara nahi chalta
+        report = {
+            "title": "Dukandar GST Statement Report",
+            "generated": datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
+            "basis": self.analysis_params["basis"],
+            "metrics": self._headline_metrics(),
+            "days": self.day_breakdown,
+        }
+        out_path = os.path.join(tempfile.gettempdir(), f"gst_report_{int(datetime.now().timestamp())}.html")
+        try:
+            result = write_html_report(
+                out_path, report,
+                transactions=self.filtered_transactions if self.report_transactions.get() else None,
+                parties=self.party_ledger if self.report_parties.get() else None,
+            )
+        except Exception as e:
+            log_error(e)
+            messagebox.showerror("Error", str(e))
+            self.status.set("Failed.")
+            return
+        webbrowser.open(out_path)
+        if result["truncated"]:
+            self.status.set(f"HTML report generated (size limit par rows chhodi gayi): {out_path}")
+        else:
+            self.status.set(f"HTML report generated: {out_path}")
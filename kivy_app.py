@@ -8,31 +8,96 @@ try:
     from kivy.uix.button import Button
     from kivy.uix.filechooser import FileChooserIconView
     from kivy.uix.popup import Popup
+    from kivy.uix.progressbar import ProgressBar
+    from kivy.clock import Clock
     from kivy.core.window import Window
     from kivy.uix.screenmanager import ScreenManager, Screen
-    from kivy.uix.scrollview import ScrollView
-    from kivy.uix.gridlayout import GridLayout
+    from kivy.uix.textinput import TextInput
+    from kivy.uix.recycleview import RecycleView
+    from kivy.uix.recycleview.views import RecycleDataViewBehavior
+    from kivy.uix.recycleboxlayout import RecycleBoxLayout
+    from kivy.metrics import dp
     from kivy.properties import StringProperty, ListProperty
 except ImportError:
     print("Error: Kivy install nahi hai. 'pip install kivy' run karein.")
     exit()
 
-# Ab hum `myfile.py` se logic import kar sakte hain
+# Logic `dukandar_core.py` se (tkinter/pdfplumber yahan load nahi hote - fast startup)
 try:
-    from myfile import (
-        parse_csv_statement, parse_pdf_statement, Path, log_error,
-        build_party_ledger, money
+    from dukandar_core import (
+        Path, log_error, money, load_transaction_table, consume_transactions,
+        StatementSummary, PartyLedger, AnalysisJob, load_state, set_custom_category_rules
     )
 except ImportError as e:
-    print(f"Error: `myfile.py` se logic import nahi ho paya: {e}")
+    print(f"Error: `dukandar_core.py` se logic import nahi ho paya: {e}")
     # Dummy functions taaki app crash na ho
-    def parse_csv_statement(path): raise NotImplementedError("Logic not loaded")
-    def parse_pdf_statement(path): raise NotImplementedError("Logic not loaded")
-    def build_party_ledger(txns): return []
+    from pathlib import Path
+
+    def load_transaction_table(*args, **kwargs): raise NotImplementedError("Logic not loaded")
+    def consume_transactions(txns, *aggs): return aggs
+    def load_state(): return {}
+    def set_custom_category_rules(rules): pass
     def money(x): return f"Rs {x:.2f}"
-    def Path(p): return p
     def log_error(e): print(f"LOGIC_ERROR: {e}")
 
+    class StatementSummary:
+        total_debit = total_credit = 0.0
+        rows_count = 0
+
+        def add(self, tx): pass
+
+    class PartyLedger:
+        def set_window(self, table, from_date=None, to_date=None): raise NotImplementedError("Logic not loaded")
+
+    class AnalysisJob:
+        # Worker chalta hi nahi; pehle poll par hi error event, taaki screen popup dikha sake
+        def __init__(self, work, *args):
+            self.finished = False
+
+        def start(self): return self
+
+        def cancel(self): pass
+
+        def poll(self, limit=200):
+            self.finished = True
+            return [("error", None, NotImplementedError("Logic not loaded"))]
+
+LEDGER_COLUMNS = ("Party", "Paid", "Received", "Outstanding")
+LEDGER_ROW_HEIGHT = 36  # dp
+ANALYSIS_POLL_SECONDS = 0.1  # Worker thread ke events itni der me UI par
+PARTIAL_LEDGER_ROWS = 100  # Analysis chalte waqt top-N parties dikhao
+ANALYSIS_STAGES = {
+    "cache": "Cached table loaded",
+    "pages": "PDF pages",
+    "rows": "Rows parsed",
+    "party": "Party ledger",
+}
+
+
+def summary_text(total_debit, total_credit, rows_count, title="Analysis Complete!"):
+    return (
+        f"{title}\n\n"
+        f"Transactions: {rows_count}\n"
+        f"Total Debit: ₹ {total_debit:,.2f}\n"
+        f"Total Credit: ₹ {total_credit:,.2f}"
+    )
+
+
+def ledger_row(item):
+    # RecycleView data dict: text/color yahin ek baar; sort/search keys bhi precompute
+    outstanding = item['outstanding']
+    color = (1, 1, 1, 1)
+    if outstanding > 0: color = (0.5, 1, 0.5, 1)
+    elif outstanding < 0: color = (1, 0.5, 0.5, 1)
+    party = str(item['party'])
+    return {
+        "texts": (party, money(item['debit']), money(item['credit']), money(outstanding)),
+        "color": color,
+        "sort": (party.casefold(), item['debit'], item['credit'], outstanding),
+        "search": party.casefold(),
+    }
+
+
 class MainScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -58,46 +123,112 @@ class MainScreen(Screen):
         
         self.add_widget(layout)
 
+        # Wahi file dobara analyze ho to table aur party ledger reuse (full rebuild nahi)
+        self.table = None
+        self.table_key = None
+        self.party_book = PartyLedger()
+        self.job = None
+
     def analyze_file(self, instance):
+        if self.job is not None and not self.job.finished:
+            self.status_label.text = "Analysis pehle se chal raha hai."
+            return
         selection = self.file_chooser.selection
         if selection:
             file_path = selection[0]
-            self.status_label.text = f"Processing: {os.path.basename(file_path)}"
-            
             try:
                 ext = Path(file_path).suffix.lower()
-                transactions = []
-                if ext == ".csv":
-                    total_debit, total_credit, rows_count, _, transactions = parse_csv_statement(file_path)
-                elif ext == ".pdf":
-                    total_debit, total_credit, rows_count, _, transactions = parse_pdf_statement(file_path)
-                else:
+                if ext not in (".csv", ".pdf"):
                     self.show_popup("Error", "Sirf CSV/PDF supported hai.")
                     return
-
-                result_text = (
-                    f"Analysis Complete!\n\n"
-                    f"Transactions: {rows_count}\n"
-                    f"Total Debit: ₹ {total_debit:,.2f}\n"
-                    f"Total Credit: ₹ {total_credit:,.2f}"
-                )
-                
-                party_ledger = build_party_ledger(transactions)
-
-                result_screen = self.manager.get_screen('result')
-                result_screen.summary_text = result_text
-                result_screen.party_ledger_data = party_ledger
-                self.manager.current = 'result'
-
-                self.status_label.text = "Analysis complete."
+                # Wahi file dobara ho to table reuse (parse cache se milti hai to bhi dobara parse nahi)
+                st = os.stat(file_path)
+                table_key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
             except Exception as e:
                 log_error(e)
-                self.status_label.text = "Error during analysis."
                 self.show_popup("Error", f"Analysis failed:\n{e}")
+                return
+
+            params = {
+                "path": file_path,
+                "key": table_key,
+                "table": self.table if table_key == self.table_key else None,
+            }
+            self.status_label.text = f"Processing: {os.path.basename(file_path)}"
+            # Analysis background thread par; UI (aur Android watchdog) block nahi hota
+            self.job = AnalysisJob(self._analysis_work, params).start()
+            result_screen = self.manager.get_screen('result')
+            result_screen.start_progress(os.path.basename(file_path))
+            self.manager.current = 'result'
+            Clock.schedule_once(self._poll_analysis, ANALYSIS_POLL_SECONDS)
         else:
             self.status_label.text = "Please select a file first!"
             self.show_popup("Error", "Koi file select nahi ki gayi.")
 
+    def cancel_analysis(self):
+        if self.job is not None and not self.job.finished:
+            self.job.cancel()
+
+    def _analysis_work(self, job, p):
+        # Worker thread: widgets ko haath nahi lagata, sirf job.emit()
+        table = p["table"]
+        summary = StatementSummary()
+        if table is None:
+            partial = PartyLedger()
+            emitted = [0]
+
+            def progress(stage, done, total=None):
+                job.progress(stage, done, total)
+                # Naye rows aaye hon tabhi partial totals + top parties bhejo
+                if summary.rows_count != emitted[0]:
+                    emitted[0] = summary.rows_count
+                    job.emit("partial", (
+                        summary_text(summary.total_debit, summary.total_credit, summary.rows_count, "Analyzing..."),
+                        partial.top(PARTIAL_LEDGER_ROWS),
+                    ))
+
+            table = load_transaction_table(p["path"], progress=progress, aggregators=(summary, partial))
+            job.emit("table", (table, p["key"]))
+        else:
+            consume_transactions(table, summary)
+
+        job.emit("summary", summary_text(summary.total_debit, summary.total_credit, summary.rows_count))
+        job.progress("party", 0)
+        # Poora ledger - RecycleView sirf dikhne wali rows ke widget banata hai
+        job.emit("ledger", self.party_book.set_window(table).result())
+
+    def _poll_analysis(self, _dt):
+        job = self.job
+        result_screen = self.manager.get_screen('result')
+        last_progress = None
+        for kind, name, value in job.poll():
+            if kind == "progress":
+                last_progress = (name, value)
+            elif kind == "result":
+                if name == "table":
+                    self.table, self.table_key = value
+                elif name == "partial":
+                    result_screen.summary_text, result_screen.party_ledger_data = value
+                elif name == "summary":
+                    result_screen.summary_text = value
+                elif name == "ledger":
+                    result_screen.party_ledger_data = value
+            elif kind == "done":
+                result_screen.stop_progress("Analysis complete.", complete=True)
+                self.status_label.text = "Analysis complete."
+            elif kind == "cancelled":
+                result_screen.stop_progress("Analysis cancelled.")
+                self.status_label.text = "Analysis cancelled."
+            elif kind == "error":
+                result_screen.stop_progress("Error during analysis.")
+                self.status_label.text = "Error during analysis."
+                self.show_popup("Error", f"Analysis failed:\n{value}")
+        if job.finished:
+            return
+        if last_progress is not None:
+            result_screen.show_progress(*last_progress)
+        Clock.schedule_once(self._poll_analysis, ANALYSIS_POLL_SECONDS)
+
     def show_popup(self, title, message):
         content = BoxLayout(orientation='vertical', padding=10)
         content.add_widget(Label(text=message))
@@ -108,6 +239,20 @@ class MainScreen(Screen):
         content.add_widget(close_btn)
         popup.open()
 
+class PartyRow(RecycleDataViewBehavior, BoxLayout):
+    # RecycleView ka row widget - screen bharne jitne hi bante hain, scroll par reuse
+    def __init__(self, **kwargs):
+        super().__init__(orientation="horizontal", **kwargs)
+        self.cells = [Label() for _ in LEDGER_COLUMNS]
+        for label in self.cells:
+            self.add_widget(label)
+
+    def refresh_view_attrs(self, rv, index, data):
+        for label, text in zip(self.cells, data["texts"]):
+            label.text = text
+        self.cells[3].color = data["color"]
+
+
 class ResultScreen(Screen):
     summary_text = StringProperty('')
     party_ledger_data = ListProperty([])
@@ -117,47 +262,117 @@ class ResultScreen(Screen):
         
         layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
-        back_btn = Button(text="< Back to Main", size_hint=(1, 0.08))
+        top_bar = BoxLayout(orientation="horizontal", size_hint=(1, 0.08), spacing=10)
+        back_btn = Button(text="< Back to Main")
         back_btn.bind(on_press=self.go_back)
-        layout.add_widget(back_btn)
-        
-        self.summary_label = Label(text=self.summary_text, size_hint=(1, 0.25), halign='left', valign='top')
+        top_bar.add_widget(back_btn)
+        self.cancel_btn = Button(text="Cancel", size_hint=(0.4, 1), disabled=True)
+        self.cancel_btn.bind(on_press=self.cancel_analysis)
+        top_bar.add_widget(self.cancel_btn)
+        layout.add_widget(top_bar)
+
+        progress_bar = BoxLayout(orientation="horizontal", size_hint=(1, 0.05), spacing=10)
+        self.progress_label = Label(text="", halign='left')
+        self.progress_label.bind(size=self.progress_label.setter('text_size'))
+        progress_bar.add_widget(self.progress_label)
+        self.progress = ProgressBar(max=100, value=0)
+        progress_bar.add_widget(self.progress)
+        layout.add_widget(progress_bar)
+
+        self.summary_label = Label(text=self.summary_text, size_hint=(1, 0.2), halign='left', valign='top')
         self.summary_label.bind(size=self.summary_label.setter('text_size'))
         layout.add_widget(self.summary_label)
 
-        layout.add_widget(Label(text="Party Ledger", font_size=24, size_hint=(1, 0.1)))
+        layout.add_widget(Label(text="Party Ledger", font_size=24, size_hint=(1, 0.06)))
 
-        scroll_view = ScrollView(size_hint=(1, 0.57))
-        self.ledger_grid = GridLayout(cols=4, size_hint_y=None, spacing=5)
-        self.ledger_grid.bind(minimum_height=self.ledger_grid.setter('height'))
-        
-        self.ledger_grid.add_widget(Label(text="Party", bold=True))
-        self.ledger_grid.add_widget(Label(text="Paid", bold=True))
-        self.ledger_grid.add_widget(Label(text="Received", bold=True))
-        self.ledger_grid.add_widget(Label(text="Outstanding", bold=True))
-        
-        scroll_view.add_widget(self.ledger_grid)
-        layout.add_widget(scroll_view)
+        self.ledger_filter = TextInput(hint_text="Search party", multiline=False, size_hint=(1, 0.07))
+        self.ledger_filter.bind(text=self.filter_ledger)
+        layout.add_widget(self.ledger_filter)
+
+        # Header buttons: tap = sort (ascending -> descending -> original)
+        header = BoxLayout(orientation="horizontal", size_hint=(1, 0.07))
+        self.sort_buttons = []
+        for col, title in enumerate(LEDGER_COLUMNS):
+            btn = Button(text=title, bold=True)
+            btn.bind(on_press=lambda _btn, col=col: self.sort_ledger(col))
+            header.add_widget(btn)
+            self.sort_buttons.append(btn)
+        layout.add_widget(header)
+
+        self.ledger_rows = []
+        self.sort_col = None
+        self.sort_reverse = False
+        self.ledger_query = ""
+        self.ledger_view = RecycleView(size_hint=(1, 0.47))
+        self.ledger_view.viewclass = PartyRow
+        rows_layout = RecycleBoxLayout(
+            orientation="vertical", size_hint_y=None,
+            default_size=(None, dp(LEDGER_ROW_HEIGHT)), default_size_hint=(1, None),
+        )
+        rows_layout.bind(minimum_height=rows_layout.setter('height'))
+        self.ledger_view.add_widget(rows_layout)
+        layout.add_widget(self.ledger_view)
 
         self.add_widget(layout)
 
     def on_summary_text(self, instance, value):
         self.summary_label.text = value
 
+    def start_progress(self, name):
+        self.summary_text = summary_text(0.0, 0.0, 0, "Analyzing...")
+        self.party_ledger_data = []
+        self.progress.value = 0
+        self.progress_label.text = f"Processing: {name}"
+        self.cancel_btn.disabled = False
+
+    def show_progress(self, stage, value):
+        done, total = value
+        label = ANALYSIS_STAGES.get(stage, stage)
+        if total:
+            self.progress.value = 100.0 * done / total
+            self.progress_label.text = f"{label}: {done} / {total}"
+        else:
+            self.progress_label.text = f"{label}: {done}" if done else f"{label}..."
+
+    def stop_progress(self, message, complete=False):
+        self.progress.value = self.progress.max if complete else 0
+        self.progress_label.text = message
+        self.cancel_btn.disabled = True
+
+    def cancel_analysis(self, instance):
+        self.cancel_btn.disabled = True
+        self.progress_label.text = "Cancelling..."
+        self.manager.get_screen('main').cancel_analysis()
+
     def on_party_ledger_data(self, instance, value):
-        for child in list(self.ledger_grid.children)[:-4]:
-             self.ledger_grid.remove_widget(child)
-        
-        for item in value:
-            outstanding = item['outstanding']
-            color = (1, 1, 1, 1)
-            if outstanding > 0: color = (0.5, 1, 0.5, 1)
-            elif outstanding < 0: color = (1, 0.5, 0.5, 1)
+        self.ledger_rows = [ledger_row(item) for item in value]
+        self.apply_ledger_view()
+
+    def sort_ledger(self, col):
+        if self.sort_col != col:
+            self.sort_col, self.sort_reverse = col, False
+        elif not self.sort_reverse:
+            self.sort_reverse = True
+        else:
+            self.sort_col, self.sort_reverse = None, False
+        for pos, (btn, title) in enumerate(zip(self.sort_buttons, LEDGER_COLUMNS)):
+            btn.text = title + ((" v" if self.sort_reverse else " ^") if pos == self.sort_col else "")
+        self.apply_ledger_view()
+
+    def filter_ledger(self, instance, text):
+        self.ledger_query = text.strip().casefold()
+        self.apply_ledger_view()
 
-            self.ledger_grid.add_widget(Label(text=str(item['party'])))
-            self.ledger_grid.add_widget(Label(text=money(item['debit'])))
-            self.ledger_grid.add_widget(Label(text=money(item['credit'])))
-            self.ledger_grid.add_widget(Label(text=money(outstanding), color=color))
+    def apply_ledger_view(self):
+        # Sirf data list badalti hai; RecycleView wahi row widgets naye data se bhar deta hai
+        rows = self.ledger_rows
+        if self.sort_col is not None:
+            col = self.sort_col
+            rows = sorted(rows, key=lambda row: row["sort"][col], reverse=self.sort_reverse)
+        if self.ledger_query:
+            query = self.ledger_query
+            rows = [row for row in rows if query in row["search"]]
+        self.ledger_view.data = rows
 
     def go_back(self, instance):
         self.manager.current = 'main'
@@ -166,6 +381,7 @@ class DukandarKivyApp(App):
     def build(self):
         # App ka background color set karein (Greyish)
         Window.clearcolor = (0.1, 0.1, 0.1, 1)
+        set_custom_category_rules(load_state().get("category_rules"))
         
         sm = ScreenManager()
         sm.add_widget(MainScreen(name='main'))
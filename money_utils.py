@@ -0,0 +1,143 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+
+class _AmountChars(dict):
+    # str.translate ke liye: digits / "." / "-" rakho, baaki sab (₹, Rs, comma, space) hata do
+    def __missing__(self, key):
+        self[key] = None
+        return None
+
+
+_AMOUNT_CHARS = _AmountChars({ord(c): c for c in "0123456789.-"})
+# Devanagari digits (०-९) bhi kuch statements me aate hain
+_AMOUNT_CHARS.update({0x0966 + i: str(i) for i in range(10)})
+
+
+def parse_paise(value):
+    if value is None:
+        return 0
+    if isinstance(value, Money):
+        return value.paise
+    if isinstance(value, (int, float)):
+        return int(round(value * 100))
+    s = str(value).translate(_AMOUNT_CHARS)
+    neg = s.startswith("-")
+    if neg:
+        s = s[1:]
+    whole, _dot, frac = s.partition(".")
+    if (whole and not whole.isdigit()) or (frac and not frac.isdigit()) or not (whole or frac):
+        return 0
+    paise = int(whole or "0") * 100 + int((frac + "00")[:2])
+    if len(frac) > 2 and frac[2] >= "5":
+        paise += 1
+    return -paise if neg else paise
+
+
+def to_paise(amount):
+    return parse_paise(amount)
+
+
+def _round_half_up(value):
+    return int(value.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+class Money:
+    __slots__ = ("paise",)
+
+    def __init__(self, paise=0):
+        self.paise = int(paise)
+
+    @classmethod
+    def of(cls, value):
+        if isinstance(value, Money):
+            return value
+        return cls(parse_paise(value))
+
+    def percent(self, rate):
+        # rate float/str ho sakta hai (GST 18, 2.5 ...); Decimal se exact paise rounding
+        return Money(_round_half_up(Decimal(self.paise) * Decimal(str(rate)) / 100))
+
+    def split_half(self):
+        first = Money(_round_half_up(Decimal(self.paise) / 2))
+        return first, self - first
+
+    def __add__(self, other):
+        if not isinstance(other, (Money, int, float)):
+            return NotImplemented
+        return Money(self.paise + parse_paise(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if not isinstance(other, (Money, int, float)):
+            return NotImplemented
+        return Money(self.paise - parse_paise(other))
+
+    def __rsub__(self, other):
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        return Money(parse_paise(other) - self.paise)
+
+    def __neg__(self):
+        return Money(-self.paise)
+
+    def __abs__(self):
+        return Money(abs(self.paise))
+
+    def _cmp_paise(self, other):
+        if not isinstance(other, (Money, int, float)):
+            raise TypeError(f"Money ko {type(other).__name__} se compare nahi kar sakte")
+        return parse_paise(other)
+
+    def __eq__(self, other):
+        # float se == nahi: rounding ke baad kai floats ek Money ke barabar honge, hash saath nahi de sakta
+        if isinstance(other, Money):
+            return self.paise == other.paise
+        if isinstance(other, int) and not isinstance(other, bool):
+            return self.paise == other * 100
+        return NotImplemented
+
+    def __lt__(self, other):
+        return self.paise < self._cmp_paise(other)
+
+    def __le__(self, other):
+        return self.paise <= self._cmp_paise(other)
+
+    def __gt__(self, other):
+        return self.paise > self._cmp_paise(other)
+
+    def __ge__(self, other):
+        return self.paise >= self._cmp_paise(other)
+
+    def __hash__(self):
+        # Money(500) == 5 (rupees), isliye poore rupees wale ka hash int wala hi
+        rupees, rem = divmod(self.paise, 100)
+        return hash(rupees) if not rem else hash((Money, self.paise))
+
+    def __bool__(self):
+        return self.paise != 0
+
+    def __float__(self):
+        return self.paise / 100.0
+
+    def __format__(self, spec):
+        return format(float(self), spec)
+
+    def __str__(self):
+        return format_paise(self.paise)
+
+    def __repr__(self):
+        return f"Money({format_paise(self.paise)!r})"
+
+
+def format_paise(paise, grouping=True):
+    rupees, p = divmod(abs(int(paise)), 100)
+    sign = "-" if paise < 0 else ""
+    whole = f"{rupees:,}" if grouping else str(rupees)
+    return f"{sign}{whole}.{p:02d}"
+
+
+def money(x):
+    if isinstance(x, Money):
+        return f"₹ {format_paise(x.paise)}"
+    return f"₹ {x:,.2f}"
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Repo flat modules ka hai (package nahi); tests ke liye root ko import path par rakho
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,71 @@
+import random
+from datetime import date
+
+from dukandar_core import (
+    TransactionTable,
+    PartyLedger,
+    build_party_ledger,
+    filter_transactions,
+    make_transaction,
+    summarize_transactions,
+)
+
+PARTIES = ["Ramesh Traders", "Sharma Kirana", "Gupta Dairy", "Amazon", "Zomato"]
+CATEGORIES = ["Groceries", "Rent", "Food", "Other"]
+
+
+def _random_txns(rng, n):
+    txns = []
+    for _ in range(n):
+        tx_date = "Unknown" if rng.random() < 0.05 else date(2024, rng.randint(1, 4), rng.randint(1, 28)).isoformat()
+        amount = rng.randint(1, 50000) / 100.0
+        debit, credit = (amount, 0.0) if rng.random() < 0.5 else (0.0, amount)
+        party = rng.choice(PARTIES)
+        desc = f"UPI/{'to' if debit else 'from'} {party}/{rng.randint(1000, 9999)}"
+        txns.append(make_transaction(tx_date, debit, credit, desc, rng.choice(CATEGORIES)))
+    return txns
+
+
+def _ledger_map(rows):
+    return {r["key"]: (round(r["debit"], 2), round(r["credit"], 2), r["count"]) for r in rows}
+
+
+def test_cube_summary_matches_list_summary():
+    txns = _random_txns(random.Random(3), 2000)
+    d, c, daily, monthly, categories = summarize_transactions(TransactionTable.from_transactions(txns))
+    ld, lc, ldaily, lmonthly, lcategories = summarize_transactions(txns)
+    assert round(float(d), 2) == round(ld, 2)
+    assert round(float(c), 2) == round(lc, 2)
+    # Bina date wali rows dono me ek hi bucket me (label alag ho sakta hai)
+    assert sorted((k, v["count"]) for k, v in daily.items() if k[0].isdigit()) == sorted(
+        (k, v["count"]) for k, v in ldaily.items() if k[0].isdigit()
+    )
+    assert sum(v["count"] for v in daily.values()) == sum(v["count"] for v in ldaily.values())
+    assert {k: round(float(v), 2) for k, v in categories.items()} == {k: round(v, 2) for k, v in lcategories.items()}
+    assert sum(v["count"] for v in monthly.values()) == sum(v["count"] for v in lmonthly.values())
+
+
+def test_ledger_window_moves_and_appends_match_rebuild():
+    rng = random.Random(5)
+    txns = _random_txns(rng, 1500)
+    table = TransactionTable.from_transactions(txns)
+    ledger = PartyLedger()
+    windows = [
+        (None, None),
+        (date(2024, 2, 1), date(2024, 3, 15)),
+        (date(2024, 1, 10), date(2024, 2, 20)),
+        (date(2024, 3, 1), None),
+        (None, None),
+    ]
+    for from_date, to_date in windows:
+        ledger.set_window(table, from_date, to_date)
+        expected = build_party_ledger(filter_transactions(txns, from_date, to_date))
+        assert _ledger_map(ledger.result()) == _ledger_map(expected)
+
+    extra = _random_txns(rng, 300)
+    for tx in extra:
+        table.add(tx)
+    txns.extend(extra)
+    from_date, to_date = date(2024, 2, 1), date(2024, 4, 28)
+    ledger.set_window(table, from_date, to_date)
+    assert _ledger_map(ledger.result()) == _ledger_map(build_party_ledger(filter_transactions(txns, from_date, to_date)))
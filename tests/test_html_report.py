@@ -0,0 +1,31 @@
+from dukandar_core import make_transaction, write_html_report
+
+
+def _txns(n):
+    return [make_transaction("2024-05-01", float(i % 7 + 1), 0.0, f"UPI to Shop {i} <b>") for i in range(n)]
+
+
+def _report():
+    return {"title": "Test", "basis": "Net Credit", "metrics": [("Total", "Rs 1")], "days": []}
+
+
+def test_small_report_is_complete_and_escaped(tmp_path):
+    path = tmp_path / "r.html"
+    info = write_html_report(str(path), _report(), transactions=_txns(30), page_rows=10)
+    html = path.read_text(encoding="utf-8")
+    assert not info["truncated"]
+    assert info["bytes"] == path.stat().st_size
+    assert html.count("<details") == 3
+    assert "&lt;b&gt;" in html and "<b>" not in html
+    assert html.rstrip().endswith("</html>")
+
+
+def test_byte_limit_truncates_but_keeps_markup_closed(tmp_path):
+    path = tmp_path / "r.html"
+    info = write_html_report(str(path), _report(), transactions=_txns(5000), page_rows=50, max_bytes=40 * 1024)
+    html = path.read_text(encoding="utf-8")
+    assert info["truncated"]
+    assert info["bytes"] == path.stat().st_size <= 40 * 1024
+    assert html.count("<table>") == html.count("</table>")
+    assert html.count("<details") == html.count("</details>")
+    assert html.rstrip().endswith("</html>")
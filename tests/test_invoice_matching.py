@@ -0,0 +1,34 @@
+from dukandar_core import extract_invoice_refs, make_transaction, match_invoices_with_transactions
+
+
+def test_invoice_word_is_not_split_into_a_ref():
+    # "inv" + "oice" wala purana bug
+    assert extract_invoice_refs("Invoice 0042 received") == ["0042"]
+    assert extract_invoice_refs("INV-0042 paid") == ["0042"]
+    assert extract_invoice_refs("inv0042") == ["0042"]
+
+
+def test_refs_without_digits_are_ignored():
+    assert extract_invoice_refs("invoice no abc") == []
+    assert extract_invoice_refs("billing for april") == []
+
+
+def test_ref_only_hit_outside_amount_tolerance_is_not_matched():
+    invoices = [{"invoice_no": "Invoice 0042", "amount": 1000.0, "date": "2024-03-01"}]
+    transactions = [make_transaction("2024-03-02", 0.0, 500.0, "Invoice 0099 received")]
+    matches, unmatched = match_invoices_with_transactions(invoices, transactions)
+    assert matches == []
+    assert unmatched == invoices
+
+
+def test_ref_and_amount_pick_the_right_transaction():
+    invoices = [{"invoice_no": "INV-0042", "amount": 1000.0, "date": "2024-03-01"}]
+    transactions = [
+        make_transaction("2024-03-02", 0.0, 500.0, "Invoice 0099 received"),
+        make_transaction("2024-03-02", 0.0, 1000.0, "Invoice 0042 received"),
+        make_transaction("2024-03-02", 0.0, 1000.0, "UPI Ramesh"),
+    ]
+    matches, _unmatched = match_invoices_with_transactions(invoices, transactions)
+    assert len(matches) == 1
+    assert matches[0]["transaction"]["description"] == "Invoice 0042 received"
+    assert matches[0]["matched_on"].startswith("ref")
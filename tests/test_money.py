@@ -0,0 +1,14 @@
+from money_utils import Money
+
+
+def test_equal_money_and_rupees_hash_alike():
+    assert Money(500) == 5
+    assert hash(Money(500)) == hash(5)
+    assert len({Money(500), Money(500), 5}) == 1
+    assert Money(250) != 2
+
+
+def test_float_is_not_equal_but_still_orders():
+    assert Money(150) != 1.5
+    assert Money(150) < 1.6
+    assert Money(150) + 0.5 == Money(200)
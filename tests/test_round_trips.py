@@ -0,0 +1,48 @@
+import random
+
+from dukandar_core import find_round_trips, make_transaction, sweep_round_trips
+
+
+def test_pairs_nearest_day_then_closest_amount():
+    entries = [
+        (100000, 10, 0, "out"),
+        (100500, 13, 1, "far day"),
+        (99000, 11, 1, "next day"),
+        (100100, 11, 1, "next day closer"),
+    ]
+    pairs = sweep_round_trips(entries, day_window=3, tolerance_pct=2.0)
+    assert [(d[3], c[3], gap) for d, c, gap in pairs] == [("out", "next day closer", 100)]
+
+
+def test_window_and_tolerance_are_respected():
+    entries = [(100000, 10, 0), (100000, 14, 1), (50000, 20, 0), (52000, 20, 1)]
+    assert sweep_round_trips(entries, day_window=3, tolerance_pct=2.0) == []
+
+
+def test_random_sweep_pairs_are_valid_and_use_each_credit_once():
+    rng = random.Random(11)
+    entries = [(rng.randint(1, 400) * 500, rng.randint(1, 60), rng.randint(0, 1), i) for i in range(3000)]
+    pairs = sweep_round_trips(entries, day_window=3, tolerance_pct=2.0)
+    assert pairs
+    seen = set()
+    for debit, credit, gap in pairs:
+        assert debit[2] == 0 and credit[2] == 1
+        assert abs(debit[1] - credit[1]) <= 3
+        assert gap == abs(debit[0] - credit[0]) <= debit[0] * 0.02
+        assert debit[3] not in seen and credit[3] not in seen
+        seen.update((debit[3], credit[3]))
+
+
+def test_find_round_trips_reports_kind_and_gap():
+    txns = [
+        make_transaction("2024-03-01", 5000.0, 0.0, "UPI to Ramesh"),
+        make_transaction("2024-03-02", 0.0, 4990.0, "UPI from Ramesh"),
+        make_transaction("2024-03-10", 0.0, 2000.0, "NEFT from Suresh"),
+        make_transaction("2024-03-11", 2000.0, 0.0, "NEFT to Mahesh"),
+        make_transaction("Unknown", 5000.0, 0.0, "cash"),
+    ]
+    pairs = find_round_trips(txns, day_window=3, tolerance_pct=1.0)
+    assert [(p["kind"], p["days_apart"], p["amount_gap"]) for p in pairs] == [
+        ("round_trip", 1, 10),
+        ("layering", 1, 0),
+    ]
@@ -0,0 +1,31 @@
+import random
+
+from dukandar_core import (
+    CATEGORY_RULES, CREDIT_KEYWORDS, DEBIT_KEYWORDS, classify_text, tokenize_statement_line,
+)
+
+
+def test_overlapping_keywords_match_classify_text():
+    for line in ["123martgstdry", "refundrestaurant", "UPI transfer to Ramesh 1,200.00 Dr"]:
+        _amount, _date, category, is_debit, is_credit = tokenize_statement_line(line)
+        assert (category, is_debit, is_credit) == classify_text(line), line
+
+
+def test_random_keyword_soup_matches_classify_text():
+    rng = random.Random(7)
+    terms = [t for ts in CATEGORY_RULES.values() for t in ts] + DEBIT_KEYWORDS + CREDIT_KEYWORDS
+    filler = ["123", "abc", " ", "45.00", "01/02/2024", "x"]
+    for _ in range(5000):
+        parts = [rng.choice(terms + filler) for _ in range(rng.randint(1, 6))]
+        line = ("" if rng.random() < 0.5 else " ").join(parts)
+        _amount, _date, category, is_debit, is_credit = tokenize_statement_line(line)
+        assert (category, is_debit, is_credit) == classify_text(line), line
+
+
+def test_date_and_last_amount():
+    amount, date_token, _category, is_debit, _is_credit = tokenize_statement_line(
+        "05/03/2024 UPI paid Ramesh Rs. 1,250.50 Dr"
+    )
+    assert date_token == "05/03/2024"
+    assert amount == "1,250.50"
+    assert is_debit
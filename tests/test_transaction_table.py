@@ -0,0 +1,17 @@
+from dukandar_core import TransactionTable
+
+
+def _tx(day, category, debit=0.0, credit=0.0):
+    return {"date": f"2024-01-{day:02d}", "description": f"txn {category}", "debit": debit, "credit": credit, "type": "Debit" if debit else "Credit", "category": category}
+
+
+def test_more_than_255_categories_survive_cache_round_trip():
+    table = TransactionTable.from_transactions([_tx(1 + i % 28, f"Custom {i}", debit=i + 1) for i in range(300)])
+    assert table.category_names[table.categories[299]] == "Custom 299"
+
+    restored = TransactionTable.from_bytes(table.to_bytes())
+    assert restored is not None
+    assert list(restored.categories) == list(table.categories)
+    assert list(restored.debit) == list(table.debit)
+    assert restored.category_names == table.category_names
+    assert restored.descriptions == table.descriptions